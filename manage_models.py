@@ -16,12 +16,18 @@ Usage:
 """
 
 import os
+import re
+import mmap
 import sys
+import json
 import argparse
 import subprocess
 import tempfile
 import shutil
 import requests
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -38,13 +44,83 @@ TRANSITIONS = [
 
 TRANSITION_BASE_URL = "https://github.com/NREL/EnergyPlus/releases/download"
 
+# Matches the IDF "Version,X.Y;" object, including the split-line form
+_VERSION_RE = re.compile(rb'^\s*Version\s*,\s*([\d.]+)\s*;', re.MULTILINE | re.IGNORECASE)
 
-def get_engine_version():
-    """Get the actual EnergyPlus engine version."""
+# Bytes scanned from the top of an IDF when looking for the Version object
+VERSION_HEAD_BYTES = 65536
+
+# Error markers in eplusout.err, e.g. "**  Fatal  **" or "** Severe  **"
+_ERR_RE = re.compile(r'\*\*\s+(Fatal|Severe|Warning)\s+\*\*')
+
+# File in the cache directory holding the last engine version probe
+ENGINE_CACHE_FILE = 'engine.json'
+
+# IDF path -> (mtime, version) for files already read this run
+_idf_version_cache = {}
+
+
+@lru_cache(maxsize=None)
+def get_engine_version(cache_dir=None):
+    """
+    Get the actual EnergyPlus engine version (probed once per process).
+    
+    If cache_dir is given, the probe result is also stored there, keyed by
+    the EnergyPlus API module path and mtime, so later runs skip the probe
+    until pyenergyplus is reinstalled or upgraded.
+    """
+    probe_key = None
+    cache_path = os.path.join(cache_dir, ENGINE_CACHE_FILE) if cache_dir else None
+    
+    if cache_path:
+        try:
+            from pyenergyplus import api as eplus_api
+            probe_key = f"{eplus_api.__file__}:{os.path.getmtime(eplus_api.__file__)}"
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+            if cached.get('key') == probe_key:
+                return cached['version']
+        except:
+            pass
+    
+    version = _probe_engine_version()
+    if version is None:
+        return "23.2.0"
+    
+    if cache_path and probe_key:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, 'w') as f:
+                json.dump({'key': probe_key, 'version': version}, f)
+        except OSError:
+            pass
+    return version
+
+
+@contextmanager
+def _suppress_output():
+    """Send fd 1/2 to the null device, silencing native EnergyPlus output too."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    saved = (os.dup(1), os.dup(2))
+    try:
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved[0], 1)
+        os.dup2(saved[1], 2)
+        for fd in (devnull, *saved):
+            os.close(fd)
+
+
+def _probe_engine_version():
+    """Run EnergyPlus on a dummy IDF and read its version banner."""
     try:
         from pyenergyplus.api import EnergyPlusAPI
-        import io
-        from contextlib import redirect_stdout, redirect_stderr
         
         api = EnergyPlusAPI()
         state = api.state_manager.new_state()
@@ -59,9 +135,11 @@ def get_engine_version():
             f.write('Version,99.9;')
         
         # Suppress console output
-        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        with _suppress_output():
             api.runtime.run_energyplus(state, ['-d', tmpdir, idf_path])
         
+        api.state_manager.delete_state(state)
+        
         if os.path.exists(err_path):
             with open(err_path, 'r') as f:
                 content = f.read()
@@ -69,41 +147,46 @@ def get_engine_version():
                     if 'Program Version' in line and 'EnergyPlus' in line:
                         parts = line.split('Version')[2].strip().split(',')[0].strip()
                         return parts.split('-')[0]
-        
-        api.state_manager.delete_state(state)
     except:
         pass
-    return "23.2.0"
+    return None
 
 
 def get_idf_version(filepath):
-    """Extract version from an IDF file."""
+    """Extract version from an IDF file (cached until the file changes)."""
+    try:
+        mtime = os.path.getmtime(filepath)
+    except OSError:
+        return None
+    
+    cached = _idf_version_cache.get(filepath)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    version = _read_idf_version(filepath)
+    _idf_version_cache[filepath] = (mtime, version)
+    return version
+
+
+def _read_idf_version(filepath):
+    """Read the version line from an IDF file on disk."""
     try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                if 'Version,' in line and not line.strip().startswith('!'):
-                    parts = line.split(',')
-                    if len(parts) >= 2:
-                        return parts[1].strip().rstrip(';')
+        with open(filepath, 'rb') as f:
+            # The Version object sits near the top, so only the head of the
+            # mapped file is scanned, even when the object is missing
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                match = _VERSION_RE.search(mm, 0, VERSION_HEAD_BYTES)
+                if match:
+                    return match.group(1).decode()
     except:
         pass
     return None
 
 
-def compare_versions(v1, v2):
-    """Compare two version strings. Returns -1 if v1<v2, 0 if equal, 1 if v1>v2."""
-    try:
-        v1_parts = [int(x) for x in v1.split('.')[:2]]
-        v2_parts = [int(x) for x in v2.split('.')[:2]]
-        
-        for a, b in zip(v1_parts, v2_parts):
-            if a < b:
-                return -1
-            elif a > b:
-                return 1
-        return 0
-    except:
-        return 0
+def _version_tuple(version):
+    """Parse 'X.Y[.Z]' into an (X, Y) tuple of ints that compares natively."""
+    major, minor = (version.split('.') + ['0'])[:2]
+    return (int(major), int(minor))
 
 
 def get_transition_path(from_version, to_version):
@@ -182,6 +265,8 @@ def run_transition(idf_path, from_ver, to_ver, transition_exe):
             timeout=120
         )
         
+        # The tool rewrote the file, possibly within the same mtime tick
+        _idf_version_cache.pop(idf_path, None)
         new_version = get_idf_version(idf_path)
         if new_version and new_version.startswith(to_ver):
             return True, f"Upgraded to {new_version}"
@@ -212,7 +297,7 @@ def upgrade_idf(idf_path, target_version, cache_dir):
     # Create backup
     backup_path = idf_path + f".v{current_version}.backup"
     if not os.path.exists(backup_path):
-        shutil.copy2(idf_path, backup_path)
+        shutil.copyfile(idf_path, backup_path)
     
     # Run each transition
     for from_ver, to_ver in path:
@@ -228,35 +313,54 @@ def upgrade_idf(idf_path, target_version, cache_dir):
     return True, f"Upgraded from {current_version} to {final_version}"
 
 
+def _fast_move(src, dst):
+    """Move a file, renaming in place when source and destination share a filesystem."""
+    src_dir = os.path.dirname(os.path.abspath(src))
+    dst_dir = os.path.dirname(os.path.abspath(dst))
+    if os.stat(src_dir).st_dev == os.stat(dst_dir).st_dev:
+        os.replace(src, dst)
+    else:
+        shutil.move(src, dst, copy_function=shutil.copyfile)
+
+
 def find_idf_files(directory):
     """Find all IDF files in a directory."""
-    idf_files = []
-    if os.path.exists(directory):
-        for f in os.listdir(directory):
-            if f.endswith('.idf'):
-                idf_files.append(os.path.join(directory, f))
-    return idf_files
+    if not os.path.isdir(directory):
+        return []
+    with os.scandir(directory) as it:
+        return [e.path for e in it if e.name.endswith('.idf') and e.is_file()]
 
 
 def find_weather_file(weather_dir='weather'):
     """Find a weather file for testing."""
-    if os.path.exists(weather_dir):
-        for root, dirs, files in os.walk(weather_dir):
-            for f in files:
-                if f.endswith('.epw'):
-                    return os.path.join(root, f)
+    if not os.path.isdir(weather_dir):
+        return None
+    
+    # Top-down like os.walk: files in a directory before its subdirectories
+    subdirs = []
+    with os.scandir(weather_dir) as it:
+        for e in it:
+            if e.is_dir():
+                subdirs.append(e.path)
+            elif e.name.endswith('.epw'):
+                return e.path
+    for subdir in subdirs:
+        found = find_weather_file(subdir)
+        if found:
+            return found
     return None
 
 
-def test_model(idf_path, weather_file, output_dir):
-    """Test run a model to verify it works with the engine."""
+def test_model(idf_path, weather_file, output_dir, api=None):
+    """Test run a model to verify it works with the engine.
+
+    Pass a shared EnergyPlusAPI as ``api`` when testing several models so the
+    library is loaded once; only a fresh state is created per run.
+    """
     try:
-        from pyenergyplus.api import EnergyPlusAPI
-        import io
-        from contextlib import redirect_stdout, redirect_stderr
-        
-        api = EnergyPlusAPI()
-        state = api.state_manager.new_state()
+        if api is None:
+            from pyenergyplus.api import EnergyPlusAPI
+            api = EnergyPlusAPI()
         
         # Create output directory for this test
         model_name = os.path.splitext(os.path.basename(idf_path))[0]
@@ -265,9 +369,13 @@ def test_model(idf_path, weather_file, output_dir):
         
         args = ['-d', test_output, '-w', weather_file, idf_path]
         
-        # Run simulation (suppress output)
-        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
-            api.runtime.run_energyplus(state, args)
+        state = api.state_manager.new_state()
+        try:
+            # Run simulation (suppress output)
+            with _suppress_output():
+                api.runtime.run_energyplus(state, args)
+        finally:
+            api.state_manager.delete_state(state)
         
         # Check error file for severe errors
         err_path = os.path.join(test_output, 'eplusout.err')
@@ -275,11 +383,10 @@ def test_model(idf_path, weather_file, output_dir):
             with open(err_path, 'r') as f:
                 content = f.read()
                 
-            # Check for fatal errors
-            if '**  Fatal  **' in content:
-                # Count severe errors
-                severe_count = content.count('** Severe  **')
-                return False, f"Fatal error ({severe_count} severe errors)"
+            # Tally fatal/severe/warning markers in one pass
+            counts = Counter(m.group(1) for m in _ERR_RE.finditer(content))
+            if counts['Fatal']:
+                return False, f"Fatal error ({counts['Severe']} severe errors)"
             
             # Check if simulation completed
             if 'EnergyPlus Completed Successfully' in content:
@@ -289,7 +396,6 @@ def test_model(idf_path, weather_file, output_dir):
             if 'EnergyPlus Warmup Error Summary' in content:
                 return True, "Simulation completed with warnings"
         
-        api.state_manager.delete_state(state)
         return False, "Could not verify simulation status"
         
     except Exception as e:
@@ -303,7 +409,7 @@ def main():
         epilog="""
 Actions:
   - Models with HIGHER version than engine -> moved to 'higher_version/' folder
-  - Models with LOWER version than engine -> upgraded to engine version
+  - Models with LOWER version than engine -> moved to 'need_update_to_XX_Yv/' folder
   - Models matching engine version -> left unchanged
 
 Example:
@@ -324,9 +430,15 @@ Example:
     print("IDF MODEL VERSION MANAGER")
     print("=" * 70)
     
+    if args.cache_dir:
+        cache_dir = args.cache_dir
+    else:
+        cache_dir = os.path.join(tempfile.gettempdir(), 'eplus_transitions')
+    
     # Get engine version
     print("\nDetecting engine version...")
-    engine_version = get_engine_version()
+    # A dry run must not write anything, including the engine.json cache
+    engine_version = get_engine_version(None if args.dry_run else cache_dir)
     engine_major = '.'.join(engine_version.split('.')[:2])
     print(f"Engine version: {engine_version} (major: {engine_major})")
     
@@ -334,11 +446,6 @@ Example:
     model_dir = args.model_dir
     higher_version_dir = os.path.join(os.path.dirname(model_dir), 'higher_version')
     
-    if args.cache_dir:
-        cache_dir = args.cache_dir
-    else:
-        cache_dir = os.path.join(tempfile.gettempdir(), 'eplus_transitions')
-    
     if not args.dry_run:
         os.makedirs(higher_version_dir, exist_ok=True)
         os.makedirs(cache_dir, exist_ok=True)
@@ -353,7 +460,8 @@ Example:
     print(f"\nFound {len(idf_files)} IDF files in {model_dir}")
     print("=" * 70)
     
-    # Categorize files
+    # Categorize files (versions compared as (major, minor) int tuples)
+    engine_tuple = _version_tuple(engine_version)
     higher = []
     lower = []
     matching = []
@@ -363,15 +471,18 @@ Example:
         version = get_idf_version(idf_path)
         filename = os.path.basename(idf_path)
         
-        if not version:
+        try:
+            version_tuple = _version_tuple(version) if version else None
+        except ValueError:
+            version_tuple = None
+        
+        if not version_tuple:
             unknown.append((idf_path, filename, version))
             continue
         
-        cmp = compare_versions(version, engine_version)
-        
-        if cmp > 0:
+        if version_tuple > engine_tuple:
             higher.append((idf_path, filename, version))
-        elif cmp < 0:
+        elif version_tuple < engine_tuple:
             lower.append((idf_path, filename, version))
         else:
             matching.append((idf_path, filename, version))
@@ -403,7 +514,7 @@ Example:
             print(f"    {filename} (v{version}) -> {os.path.basename(higher_version_dir)}/")
             
             if not args.dry_run:
-                shutil.move(idf_path, dest_path)
+                _fast_move(idf_path, dest_path)
                 print(f"      ✓ Moved")
     
     # Process lower version files (move to need_update folder)
@@ -421,7 +532,7 @@ Example:
             print(f"    {filename} (v{version}) -> {os.path.basename(need_update_dir)}/")
             
             if not args.dry_run:
-                shutil.move(idf_path, dest_path)
+                _fast_move(idf_path, dest_path)
                 print(f"      ✓ Moved")
     
     # Test upgraded models
@@ -441,9 +552,16 @@ Example:
             test_output_dir = os.path.join('outputs', 'upgrade_tests')
             os.makedirs(test_output_dir, exist_ok=True)
             
+            # Load the engine library once and share it across test runs
+            try:
+                from pyenergyplus.api import EnergyPlusAPI
+                eplus_api = EnergyPlusAPI()
+            except Exception:
+                eplus_api = None
+            
             for idf_path, filename in upgraded_models:
                 print(f"\n  Testing {filename}...")
-                success, msg = test_model(idf_path, weather_file, test_output_dir)
+                success, msg = test_model(idf_path, weather_file, test_output_dir, api=eplus_api)
                 
                 if success:
                     print(f"    ✓ {msg}")
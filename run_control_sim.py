@@ -16,8 +16,11 @@ import os
 import sys
 import argparse
 import shutil
+from array import array
 from datetime import datetime
 
+import numpy as np
+
 
 class RuleBasedController:
     """
@@ -26,10 +29,35 @@ class RuleBasedController:
     - Current outdoor air temperature
     """
     
-    def __init__(self, api, state):
+    # Zones whose thermostat setpoints are overridden via EMS actuators
+    ZONE_NAMES = (
+        "Core_bottom", "Core_mid", "Core_top",
+        "Perimeter_bot_ZN_1", "Perimeter_bot_ZN_2", "Perimeter_bot_ZN_3", "Perimeter_bot_ZN_4",
+        "Perimeter_mid_ZN_1", "Perimeter_mid_ZN_2", "Perimeter_mid_ZN_3", "Perimeter_mid_ZN_4",
+        "Perimeter_top_ZN_1", "Perimeter_top_ZN_2", "Perimeter_top_ZN_3", "Perimeter_top_ZN_4"
+    )
+    
+    # Log one row every LOG_INTERVAL timesteps (hourly for 15-min timesteps)
+    LOG_INTERVAL = 4
+    
+    def __init__(self, api, state, n_steps=35040):
+        """
+        Args:
+            api: EnergyPlusAPI instance
+            state: EnergyPlus state the controller is attached to
+            n_steps: Expected number of timesteps, used to size the log
+                     (default: one year of 15-minute timesteps)
+        """
         self.api = api
         self.state = state
         
+        # Exchange functions called every timestep, bound once
+        exchange = api.exchange
+        self._warmup = exchange.warmup_flag
+        self._get_var = exchange.get_variable_value
+        self._get_meter = exchange.get_meter_value
+        self._set_act = exchange.set_actuator_value
+        
         # Control parameters
         self.power_threshold_high = 150000  # W - reduce cooling if above
         self.power_threshold_low = 50000    # W - can be more aggressive
@@ -41,20 +69,31 @@ class RuleBasedController:
         self.heating_setpoint_base = 21.0
         self.max_cooling_adjustment = 2.0   # Max increase in cooling setpoint
         self.max_heating_adjustment = 2.0   # Max decrease in heating setpoint
+        self._inv_power_span = 1.0 / 100000 # Power (W) above threshold for full adjustment
+        self._build_rule_table()
         
         # State variables
         self.previous_power = 0.0
         self.current_cooling_setpoint = self.cooling_setpoint_base
         self.current_heating_setpoint = self.heating_setpoint_base
+        self._last_applied = (None, None)  # (cooling, heating) last written to actuators
         
         # Handles (initialized during warmup)
         self.handles_initialized = False
         self.oat_handle = None
         self.power_handle = None
         self.zone_handles = {}  # zone_name -> (cooling_actuator, heating_actuator)
+        self._cool_h = array('i')  # cooling actuators, flattened for the callback
+        self._heat_h = array('i')  # heating actuators, same order
         
-        # Logging
-        self.log_data = []
+        # Logging (preallocated columns, grown if the run is longer)
+        n_log = n_steps // self.LOG_INTERVAL + 1
+        self._step_log = np.empty(n_log, dtype=np.int32)
+        self._oat_log = np.empty(n_log, dtype=np.float32)
+        self._power_log = np.empty(n_log, dtype=np.float32)
+        self._csp_log = np.empty(n_log, dtype=np.float32)
+        self._hsp_log = np.empty(n_log, dtype=np.float32)
+        self._log_i = 0
         self.timestep_count = 0
         
     def initialize_handles(self):
@@ -62,6 +101,9 @@ class RuleBasedController:
         if self.handles_initialized:
             return True
             
+        # Pick up any parameter changes made after construction
+        self._build_rule_table()
+        
         exchange = self.api.exchange
         
         # Outdoor air temperature
@@ -77,16 +119,9 @@ class RuleBasedController:
             "Electricity:Facility"
         )
         
-        # Get zone names and create actuator handles for setpoints
+        # Create actuator handles for zone setpoints
         # We'll use EMS actuators to override thermostat setpoints
-        zone_names = [
-            "Core_bottom", "Core_mid", "Core_top",
-            "Perimeter_bot_ZN_1", "Perimeter_bot_ZN_2", "Perimeter_bot_ZN_3", "Perimeter_bot_ZN_4",
-            "Perimeter_mid_ZN_1", "Perimeter_mid_ZN_2", "Perimeter_mid_ZN_3", "Perimeter_mid_ZN_4",
-            "Perimeter_top_ZN_1", "Perimeter_top_ZN_2", "Perimeter_top_ZN_3", "Perimeter_top_ZN_4"
-        ]
-        
-        for zone_name in zone_names:
+        for zone_name in self.ZONE_NAMES:
             # Actuator for zone thermostat cooling setpoint
             cooling_handle = exchange.get_actuator_handle(
                 self.state,
@@ -120,9 +155,45 @@ class RuleBasedController:
             return False
             
         print(f"Initialized handles for {len(self.zone_handles)} zones")
+        self._flatten_handles()
         self.handles_initialized = True
         return True
         
+    def _flatten_handles(self):
+        """Split zone_handles into parallel int arrays for the timestep loop."""
+        self._cool_h = array('i', [c for c, _ in self.zone_handles.values()])
+        self._heat_h = array('i', [h for _, h in self.zone_handles.values()])
+        
+    def _build_rule_table(self):
+        """
+        Tabulate the rule per (power class, OAT class) regime.
+        
+        Within a regime the rule is linear in the power factor, so each entry
+        holds (cooling_scale, cooling_sp, heating_scale, heating_sp) and the
+        setpoint is power_factor * scale + sp. Rows: high, mid, low power;
+        columns: hot, cold, mild OAT. Entries are sampled from
+        _rule_adjustments() at one point inside each regime.
+        """
+        c_base = self.cooling_setpoint_base
+        h_base = self.heating_setpoint_base
+        oat_points = (self.oat_hot_threshold + 1.0,
+                      self.oat_cold_threshold - 1.0,
+                      (self.oat_hot_threshold + self.oat_cold_threshold) / 2)
+        
+        # High power: sampled at a power factor of 1, the adjustment is the scale
+        full_power = self.power_threshold_high + 2.0 / self._inv_power_span
+        high = tuple((c_adj, c_base, h_adj, h_base)
+                     for c_adj, h_adj in (self._rule_adjustments(oat, full_power) for oat in oat_points))
+        
+        # Mid and low power: the adjustment is a constant offset
+        def offsets(power):
+            return tuple((0.0, c_base + c_adj, 0.0, h_base + h_adj)
+                         for c_adj, h_adj in (self._rule_adjustments(oat, power) for oat in oat_points))
+        
+        mid = offsets((self.power_threshold_high + self.power_threshold_low) / 2)
+        low = offsets(self.power_threshold_low - 1.0)
+        self._rule_table = (high, mid, low)
+        
     def compute_setpoints(self, oat, power):
         """
         Compute new setpoints based on outdoor temperature and power consumption.
@@ -133,13 +204,27 @@ class RuleBasedController:
         3. If power is low -> can be more aggressive with conditioning
         4. Outdoor temp affects the aggressiveness of adjustments
         """
+        cooling_adjustment, heating_adjustment = self._rule_adjustments(oat, power)
+        
+        # Apply adjustments
+        new_cooling = self.cooling_setpoint_base + cooling_adjustment
+        new_heating = self.heating_setpoint_base + heating_adjustment
+        
+        # Ensure deadband (cooling > heating)
+        if new_cooling - new_heating < 2.0:
+            new_cooling = new_heating + 2.0
+            
+        return new_cooling, new_heating
+        
+    def _rule_adjustments(self, oat, power):
+        """Return the (cooling, heating) setpoint adjustments, before the deadband."""
         cooling_adjustment = 0.0
         heating_adjustment = 0.0
         
         # Power-based adjustment
         if power > self.power_threshold_high:
             # High power - need to reduce consumption
-            power_factor = min((power - self.power_threshold_high) / 100000, 1.0)
+            power_factor = min((power - self.power_threshold_high) * self._inv_power_span, 1.0)
             
             if oat > self.oat_hot_threshold:
                 # Hot outside, high power -> raise cooling setpoint
@@ -161,22 +246,14 @@ class RuleBasedController:
                 # Cold outside, low power -> can heat more
                 heating_adjustment = 0.5
         
-        # Apply adjustments
-        new_cooling = self.cooling_setpoint_base + cooling_adjustment
-        new_heating = self.heating_setpoint_base + heating_adjustment
-        
-        # Ensure deadband (cooling > heating)
-        if new_cooling - new_heating < 2.0:
-            new_cooling = new_heating + 2.0
-            
-        return new_cooling, new_heating
+        return cooling_adjustment, heating_adjustment
         
     def timestep_callback(self, state):
         """Called at each timestep to apply control actions."""
         self.timestep_count += 1
         
         # Skip if in warmup
-        if self.api.exchange.warmup_flag(state):
+        if self._warmup(state):
             return
             
         # Initialize handles on first real timestep
@@ -184,43 +261,88 @@ class RuleBasedController:
             if not self.initialize_handles():
                 return
         
-        exchange = self.api.exchange
-        
         # Get current values
-        oat = exchange.get_variable_value(state, self.oat_handle)
-        power = exchange.get_meter_value(state, self.power_handle)
+        oat = self._get_var(state, self.oat_handle)
+        power = self._get_meter(state, self.power_handle)
         
-        # Compute new setpoints based on previous power and current OAT
-        new_cooling, new_heating = self.compute_setpoints(oat, self.previous_power)
+        # Compute new setpoints based on previous power and current OAT.
+        # Same rule as compute_setpoints(), looked up from _rule_table.
+        prev_power = self.previous_power
+        if prev_power > self.power_threshold_high:
+            power_factor = min((prev_power - self.power_threshold_high) * self._inv_power_span, 1.0)
+            row = self._rule_table[0]
+        else:
+            power_factor = 0.0
+            row = self._rule_table[2 if prev_power < self.power_threshold_low else 1]
         
-        # Apply setpoints to all zones
-        for zone_name, (cooling_handle, heating_handle) in self.zone_handles.items():
-            exchange.set_actuator_value(state, cooling_handle, new_cooling)
-            exchange.set_actuator_value(state, heating_handle, new_heating)
+        if oat > self.oat_hot_threshold:
+            c_scale, new_cooling, h_scale, new_heating = row[0]
+        elif oat < self.oat_cold_threshold:
+            c_scale, new_cooling, h_scale, new_heating = row[1]
+        else:
+            c_scale, new_cooling, h_scale, new_heating = row[2]
+        
+        if power_factor:
+            new_cooling += power_factor * c_scale
+            new_heating += power_factor * h_scale
+        if new_cooling - new_heating < 2.0:
+            new_cooling = new_heating + 2.0
+        
+        # Apply setpoints to all zones (actuator overrides persist, so only
+        # write when the rule output actually changed)
+        if (new_cooling, new_heating) != self._last_applied:
+            set_value = self._set_act
+            for cooling_handle, heating_handle in zip(self._cool_h, self._heat_h):
+                set_value(state, cooling_handle, new_cooling)
+                set_value(state, heating_handle, new_heating)
+            self._last_applied = (new_cooling, new_heating)
         
         # Log data periodically (every 4 timesteps = hourly for 15-min timesteps)
-        if self.timestep_count % 4 == 0:
-            self.log_data.append({
-                'timestep': self.timestep_count,
-                'oat': oat,
-                'power': power,
-                'cooling_sp': new_cooling,
-                'heating_sp': new_heating
-            })
+        if self.timestep_count % self.LOG_INTERVAL == 0:
+            i = self._log_i
+            if i == len(self._step_log):
+                self._grow_log()
+            self._step_log[i] = self.timestep_count
+            self._oat_log[i] = oat
+            self._power_log[i] = power
+            self._csp_log[i] = new_cooling
+            self._hsp_log[i] = new_heating
+            self._log_i = i + 1
             
         # Update previous power for next timestep
         self.previous_power = power
         self.current_cooling_setpoint = new_cooling
         self.current_heating_setpoint = new_heating
         
+    def _grow_log(self):
+        """Double the capacity of the log columns."""
+        n_log = 2 * len(self._step_log)
+        self._step_log = np.resize(self._step_log, n_log)
+        self._oat_log = np.resize(self._oat_log, n_log)
+        self._power_log = np.resize(self._power_log, n_log)
+        self._csp_log = np.resize(self._csp_log, n_log)
+        self._hsp_log = np.resize(self._hsp_log, n_log)
+        
+    @property
+    def log_data(self):
+        """Logged rows as a list of dicts (built on demand)."""
+        n = self._log_i
+        return [
+            {'timestep': int(t), 'oat': float(o), 'power': float(p),
+             'cooling_sp': float(c), 'heating_sp': float(h)}
+            for t, o, p, c, h in zip(self._step_log[:n], self._oat_log[:n], self._power_log[:n],
+                                     self._csp_log[:n], self._hsp_log[:n])
+        ]
+        
     def get_summary(self):
         """Return summary of control actions."""
-        if not self.log_data:
+        if not self._log_i:
             return "No control data logged"
             
-        powers = [d['power'] for d in self.log_data]
-        cooling_sps = [d['cooling_sp'] for d in self.log_data]
-        heating_sps = [d['heating_sp'] for d in self.log_data]
+        n = self._log_i
+        powers = self._power_log[:n]
+        cooling_sps = self._csp_log[:n]
+        heating_sps = self._hsp_log[:n]
         
         return f"""
 Control Summary:
@@ -228,17 +350,17 @@ Control Summary:
   Zones controlled: {len(self.zone_handles)}
   
   Power (W):
-    Min: {min(powers):,.0f}
-    Max: {max(powers):,.0f}
-    Avg: {sum(powers)/len(powers):,.0f}
+    Min: {powers.min():,.0f}
+    Max: {powers.max():,.0f}
+    Avg: {powers.mean(dtype=np.float64):,.0f}
     
   Cooling Setpoint (°C):
-    Min: {min(cooling_sps):.1f}
-    Max: {max(cooling_sps):.1f}
+    Min: {cooling_sps.min():.1f}
+    Max: {cooling_sps.max():.1f}
     
   Heating Setpoint (°C):
-    Min: {min(heating_sps):.1f}
-    Max: {max(heating_sps):.1f}
+    Min: {heating_sps.min():.1f}
+    Max: {heating_sps.max():.1f}
 """
 
 
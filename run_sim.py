@@ -53,23 +53,33 @@ def run_simulation(idf_path, epw_path, output_dir):
         # List key output files
         key_files = ['eplustbl.htm', 'eplusout.csv', 'eplusout.err', 'eplusout.eso']
         print("\nKey output files:")
+        with os.scandir(output_dir) as it:
+            entries = {e.name: e for e in it}
         for filename in key_files:
-            filepath = os.path.join(output_dir, filename)
-            if os.path.exists(filepath):
-                size = os.path.getsize(filepath)
-                print(f"  ✓ {filename} ({size:,} bytes)")
+            entry = entries.get(filename)
+            if entry is not None and entry.is_file():
+                print(f"  ✓ {filename} ({entry.stat().st_size:,} bytes)")
         
         # Check for errors
         err_file = os.path.join(output_dir, 'eplusout.err')
         if os.path.exists(err_file):
-            with open(err_file, 'r') as f:
-                content = f.read()
-                if 'Severe' in content:
-                    severe_count = content.count('** Severe  **')
-                    print(f"\n⚠ Warning: {severe_count} severe error(s) found in eplusout.err")
-                if 'Fatal' in content:
-                    print("✗ Fatal error occurred - check eplusout.err")
-                    return False
+            # Single streaming pass; a fatal error ends the run, so stop there
+            has_severe = has_fatal = False
+            severe_count = 0
+            with open(err_file, 'r', buffering=1 << 20) as f:
+                for line in f:
+                    if 'Severe' in line:
+                        has_severe = True
+                        if '** Severe  **' in line:
+                            severe_count += 1
+                    if 'Fatal' in line:
+                        has_fatal = True
+                        break
+            if has_severe:
+                print(f"\n⚠ Warning: {severe_count} severe error(s) found in eplusout.err")
+            if has_fatal:
+                print("✗ Fatal error occurred - check eplusout.err")
+                return False
         
         print(f"\nFull results: {os.path.abspath(output_dir)}")
         return True
@@ -15,6 +15,9 @@ from dataclasses import dataclass, field
 from typing import Optional, Tuple, List, Dict
 from pathlib import Path
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from bisect import bisect_left
 import math
 
 
@@ -59,6 +62,16 @@ class PVSystemConfig:
             self.temp_coeff_pmax = -0.0035
         elif self.module_type == 2:  # Thin film
             self.temp_coeff_pmax = -0.0020
+    
+    @property
+    def inverter_capacity_kw(self) -> float:
+        """AC inverter capacity (kW)."""
+        return self.system_capacity_kw / self.dc_ac_ratio
+    
+    @property
+    def base_inv_eff(self) -> float:
+        """Inverter efficiency at or above 10% load, as a fraction."""
+        return self.inverter_efficiency_pct / 100
 
 
 @dataclass
@@ -90,26 +103,64 @@ class EPWReader:
         'liquid_precip_depth', 'liquid_precip_rate'
     ]
     
+    # Weather values stored as float32 (EPW precision is well below float32's)
+    FLOAT_COLS = ('dry_bulb_c', 'ghi', 'dni', 'dhi', 'wind_speed')
+    
+    # Parsed files shared by all readers, least recently used first:
+    # (resolved path, mtime_ns, size) -> (location, data)
+    CACHE_SIZE = 16
+    _cache = OrderedDict()
+    _cache_hits = 0
+    _cache_misses = 0
+    
     def __init__(self, filepath: str):
         """
         Initialize EPW reader.
         
+        Files already parsed (same path, modification time and size) are
+        served from a shared in-memory cache.
+        
         Args:
             filepath: Path to EPW weather file
         """
         self.filepath = Path(filepath)
         self.location = {}
         self.data = None
-        self._read_file()
+        
+        st = self.filepath.stat()
+        key = (str(self.filepath.resolve()), st.st_mtime_ns, st.st_size)
+        cached = EPWReader._cache.get(key)
+        if cached is not None:
+            EPWReader._cache.move_to_end(key)
+            EPWReader._cache_hits += 1
+            self.location, self.data = cached
+        else:
+            EPWReader._cache_misses += 1
+            self._read_file()
+            EPWReader._cache[key] = (self.location, self.data)
+            if len(EPWReader._cache) > self.CACHE_SIZE:
+                EPWReader._cache.popitem(last=False)
+    
+    @classmethod
+    def clear_cache(cls):
+        """Drop all cached EPW files."""
+        cls._cache.clear()
+        cls._cache_hits = cls._cache_misses = 0
+    
+    @classmethod
+    def cache_info(cls) -> dict:
+        """Get cache statistics (hits, misses, entries, max_entries)."""
+        return {'hits': cls._cache_hits, 'misses': cls._cache_misses,
+                'entries': len(cls._cache), 'max_entries': cls.CACHE_SIZE}
     
     def _read_file(self):
         """Read and parse the EPW file."""
         with open(self.filepath, 'r') as f:
-            lines = f.readlines()
+            location_line = f.readline()
         
         # Parse header (first 8 lines)
         # Line 1: LOCATION
-        loc_parts = lines[0].strip().split(',')
+        loc_parts = location_line.strip().split(',')
         self.location = {
             'city': loc_parts[1] if len(loc_parts) > 1 else '',
             'state': loc_parts[2] if len(loc_parts) > 2 else '',
@@ -122,53 +173,155 @@ class EPWReader:
             'elevation': float(loc_parts[9]) if len(loc_parts) > 9 else 0
         }
         
-        # Parse data (skip first 8 header lines)
-        data_lines = lines[8:]
-        data = []
-        for line in data_lines:
-            if line.strip():
-                values = line.strip().split(',')
-                if len(values) >= 34:
-                    data.append(values[:34])
-        
-        # Create DataFrame
-        self.data = pd.DataFrame(data, columns=self.EPW_COLUMNS)
-        
-        # Convert numeric columns
+        # Parse data (skip first 8 header lines), reading only the columns the model uses
         numeric_cols = ['year', 'month', 'day', 'hour', 'minute', 
                        'dry_bulb_c', 'ghi', 'dni', 'dhi', 'wind_speed']
-        for col in numeric_cols:
-            self.data[col] = pd.to_numeric(self.data[col], errors='coerce')
-        
-        # EPW uses hours 1-24, converting to 0-23 for datetime where hour 24 becomes hour 0 of next day
-        self.data['hour_adj'] = self.data['hour'].astype(int) - 1
-        self.data['day_adj'] = self.data['day'].astype(int)
-        
-        mask_hour24 = self.data['hour_adj'] == -1
-        self.data.loc[mask_hour24, 'hour_adj'] = 23  # Will be previous day's hour 23
-        
-        # Create datetime index
-        self.data['datetime'] = pd.to_datetime({
-            'year': self.data['year'].astype(int),
-            'month': self.data['month'].astype(int),
-            'day': self.data['day_adj'],
-            'hour': self.data['hour_adj']
-        })
-        self.data.set_index('datetime', inplace=True)
-        
-        # Sort index to ensure monotonic
-        self.data.sort_index(inplace=True)
+        usecols = [self.EPW_COLUMNS.index(col) for col in numeric_cols]
+        try:
+            # Numeric block straight into a float32 matrix (skips pandas type inference)
+            arr = np.loadtxt(self.filepath, delimiter=',', skiprows=8, usecols=usecols,
+                             dtype=np.float32, ndmin=2, encoding='latin-1')
+            self.data = pd.DataFrame({
+                col: arr[:, i] if col in self.FLOAT_COLS else arr[:, i].astype(np.int64)
+                for i, col in enumerate(numeric_cols)
+            })
+        except ValueError:
+            # Missing or malformed fields: fall back to the tolerant pandas parser
+            self.data = pd.read_csv(
+                self.filepath, skiprows=8, header=None, usecols=usecols,
+                dtype={self.EPW_COLUMNS.index(col): np.float32 for col in self.FLOAT_COLS},
+                engine='c', memory_map=True
+            )
+            self.data.columns = numeric_cols
+            self.data.dropna(subset=['year', 'month', 'day', 'hour'], inplace=True)
+        
+        # EPW uses hours 1-24, converting to 0-23 on the same day
+        hour_adj = self.data['hour'].to_numpy().astype(np.int64) - 1
+        hour_adj[hour_adj == -1] = 23
+        
+        # Create datetime index: year -> month -> day -> hour offsets in datetime64 arithmetic
+        years = self.data['year'].to_numpy().astype(np.int64) - 1970
+        months = self.data['month'].to_numpy().astype(np.int64) - 1
+        days = self.data['day'].to_numpy().astype(np.int64) - 1
+        stamps = ((years.astype('datetime64[Y]').astype('datetime64[M]') + months)
+                  .astype('datetime64[D]') + days).astype('datetime64[h]') + hour_adj
+        self.data.index = pd.DatetimeIndex(stamps.astype('datetime64[ns]'), name='datetime')
+        
+        # Sort index to ensure monotonic (TMY months can come from different years)
+        if not self.data.index.is_monotonic_increasing:
+            self.data.sort_index(inplace=True)
+    
+    def get_data(self, mutable: bool = False) -> pd.DataFrame:
+        """
+        Get weather data as DataFrame.
         
-        # Drop helper columns
-        self.data.drop(['hour_adj', 'day_adj'], axis=1, inplace=True)
-    
-    def get_data(self) -> pd.DataFrame:
-        """Get weather data as DataFrame."""
-        return self.data
+        Args:
+            mutable: Return a private copy. By default the DataFrame is
+                     shared with the cache and must not be modified.
+        """
+        return self.data.copy() if mutable else self.data
     
     def get_location(self) -> dict:
         """Get location information."""
-        return self.location
+        return dict(self.location)
+
+
+def _solar_day_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Day-of-year solar terms used by the vectorized sun position.
+    
+    Returns:
+        (sin_declination, cos_declination, equation_of_time_min) float32
+        arrays indexed by day of year - 1 (366 entries for leap years)
+    """
+    B = 2 * np.pi * np.arange(366) / 365
+    declination = (0.006918 - 0.399912 * np.cos(B) + 0.070257 * np.sin(B)
+                  - 0.006758 * np.cos(2*B) + 0.000907 * np.sin(2*B)
+                  - 0.002697 * np.cos(3*B) + 0.00148 * np.sin(3*B))
+    eot = 229.18 * (0.000075 + 0.001868 * np.cos(B) - 0.032077 * np.sin(B)
+                   - 0.014615 * np.cos(2*B) - 0.040849 * np.sin(2*B))
+    return (np.sin(declination).astype(np.float32), np.cos(declination).astype(np.float32),
+            eot.astype(np.float32))
+
+
+_SIN_DECLINATION, _COS_DECLINATION, _EQUATION_OF_TIME = _solar_day_tables()
+
+_NS_PER_MINUTE = 60 * 10**9
+_NS_PER_DAY = 1440 * _NS_PER_MINUTE
+
+
+def _pv_kernel(doy, hour, lat_rad, lon, tz, sin_tilt, cos_tilt, surf_az_rad,
+               diffuse_factor, ground_factor, ghi, dni, dhi, ambient, wind, a, b,
+               sys_cap, temp_coeff, ref_temp, ref_irr, loss_factor, inv_capacity, inv_eff):
+    """
+    PVWatts model for a single timestep, on plain floats.
+    
+    Stages: sun position (Spencer declination/equation of time), POA irradiance
+    (isotropic sky, albedo folded into ground_factor), Sandia cell temperature,
+    PVWatts DC power and the simplified inverter curve. Array form lives in
+    SolarPVModel._sun_vector(), _poa_irradiance() and _power_from_poa();
+    keep them in sync.
+    
+    Returns:
+        (zenith_deg, azimuth_deg, poa, cell_temp, dc_power, ac_power) tuple
+    """
+    # Solar declination (Spencer, 1971) and equation of time (minutes)
+    B = 2 * math.pi * (doy - 1) / 365
+    declination = (0.006918 - 0.399912 * math.cos(B) + 0.070257 * math.sin(B)
+                  - 0.006758 * math.cos(2*B) + 0.000907 * math.sin(2*B)
+                  - 0.002697 * math.cos(3*B) + 0.00148 * math.sin(3*B))
+    eot = 229.18 * (0.000075 + 0.001868 * math.cos(B) - 0.032077 * math.sin(B)
+                   - 0.014615 * math.cos(2*B) - 0.040849 * math.sin(2*B))
+    
+    # Hour angle from solar time
+    solar_time = hour + (4 * (lon - 15*tz) + eot) / 60
+    hour_angle = math.radians(15 * (solar_time - 12))
+    
+    # Solar zenith and azimuth
+    sin_lat = math.sin(lat_rad)
+    cos_lat = math.cos(lat_rad)
+    cos_zenith = (sin_lat * math.sin(declination) +
+                 cos_lat * math.cos(declination) * math.cos(hour_angle))
+    zenith = math.acos(max(-1, min(1, cos_zenith)))
+    sin_zenith = math.sin(zenith)
+    
+    if math.cos(zenith) != 0:
+        cos_azimuth = ((math.sin(declination) * cos_lat -
+                      math.cos(declination) * sin_lat * math.cos(hour_angle)) / sin_zenith)
+        azimuth = math.acos(max(-1, min(1, cos_azimuth)))
+        if hour_angle > 0:
+            azimuth = 2 * math.pi - azimuth
+    else:
+        azimuth = math.pi
+    
+    zenith_deg = math.degrees(zenith)
+    
+    # POA irradiance: beam + diffuse + ground reflected
+    if zenith_deg >= 90:
+        poa = 0.0
+    else:
+        cos_aoi = max(0, sin_zenith * sin_tilt * math.cos(azimuth - surf_az_rad) +
+                      math.cos(zenith) * cos_tilt)
+        poa = max(0, dni * cos_aoi + dhi * diffuse_factor + ghi * ground_factor)
+    
+    # Cell temperature
+    cell_temp = poa * math.exp(a + b * wind) + ambient
+    
+    # DC power with temperature correction and system losses
+    if poa <= 0:
+        dc_power = 0.0
+    else:
+        temp_factor = 1 + temp_coeff * (cell_temp - ref_temp)
+        dc_power = max(0, sys_cap * (poa / ref_irr) * temp_factor * loss_factor)
+    
+    # AC power: efficiency ramps down below 10% load, clipped at inverter capacity
+    if dc_power <= 0:
+        ac_power = 0.0
+    else:
+        efficiency = inv_eff * min(1.0, dc_power / sys_cap / 0.1)
+        ac_power = max(0, min(dc_power * efficiency, inv_capacity))
+    
+    return zenith_deg, math.degrees(azimuth), poa, cell_temp, dc_power, ac_power
 
 
 class SolarPVModel:
@@ -189,6 +342,13 @@ class SolarPVModel:
         results = pv.simulate()
     """
     
+    # Weather columns read per timestep, in _wx_values column order
+    WEATHER_FIELDS = ('ghi', 'dni', 'dhi', 'dry_bulb_c', 'wind_speed')
+    
+    # simulate() output columns; the first five are WEATHER_FIELDS
+    RESULT_COLUMNS = ('ghi', 'dni', 'dhi', 'ambient_temp_c', 'wind_speed_m_s', 'poa_irradiance',
+                      'cell_temperature_c', 'dc_power_kw', 'ac_power_kw')
+    
     def __init__(self, config: Optional[PVSystemConfig] = None):
         """
         Initialize the PV model.
@@ -200,6 +360,15 @@ class SolarPVModel:
         self.weather_data = None
         self.location = None
         self.results = None
+        self._results_version = 0  # bumped by simulate(); keys the summary cache
+        self._summary_cache = {}   # name -> (key, summary)
+        self._ts_values = None  # weather_data index as a list of int nanoseconds
+        self._wx_values = None  # (n, 5) float32 array of WEATHER_FIELDS
+        self._state_table = None  # (n, 9) RESULT_COLUMNS for every weather row, built on demand
+        self._state_key = None    # (weather_data, config values) the table was built from
+        self._sun_cache = None  # (east, north, up) sun vector for every weather row, built on demand
+        self._sun_key = None    # (weather_data, latitude, longitude, timezone) it was built from
+        self._update_geometry_cache()
     
     def load_weather(self, filepath: str) -> dict:
         """
@@ -215,250 +384,336 @@ class SolarPVModel:
         self.weather_data = reader.get_data()
         self.location = reader.get_location()
         
+        # Raw arrays for per-timestep lookups
+        self._ts_values = self.weather_data.index.values.astype('datetime64[ns]').view(np.int64).tolist()
+        self._wx_values = self.weather_data[list(self.WEATHER_FIELDS)].to_numpy(dtype=np.float32)
+        
         # Auto-set tilt to latitude if not explicitly set
         if self.config.tilt_deg == 20.0:  # Default value
             self.config.tilt_deg = abs(self.location['latitude'])
+            self._update_geometry_cache()
         
         return self.location
     
-    def _calculate_sun_position(self, timestamp: datetime) -> Tuple[float, float]:
+    def _update_geometry_cache(self):
+        """Precompute trig terms of the array tilt/azimuth used by the POA model."""
+        tilt = math.radians(self.config.tilt_deg)
+        cos_tilt = math.cos(tilt)
+        self._tilt_rad = tilt
+        self._sin_tilt = math.sin(tilt)
+        self._cos_tilt = cos_tilt
+        self._surface_azimuth_rad = math.radians(self.config.azimuth_deg)
+        # Unit normal of the array (east, north, up); cos(AOI) is its dot
+        # product with the sun vector
+        self._surface_normal = (self._sin_tilt * math.sin(self._surface_azimuth_rad),
+                                self._sin_tilt * math.cos(self._surface_azimuth_rad),
+                                cos_tilt)
+        self._diffuse_factor = (1 + cos_tilt) / 2
+        self._ground_factor = 0.2 * (1 - cos_tilt) / 2  # albedo 0.2
+        self._geometry_key = (self.config.tilt_deg, self.config.azimuth_deg)
+    
+    def _check_geometry_cache(self):
+        """Refresh the geometry cache if the config angles were changed."""
+        if self._geometry_key != (self.config.tilt_deg, self.config.azimuth_deg):
+            self._update_geometry_cache()
+    
+    def set_orientation(self, tilt_deg: float, azimuth_deg: float):
         """
-        Calculate solar zenith and azimuth angles.
+        Re-orient the array, keeping the loaded weather and sun position.
         
         Args:
-            timestamp: Datetime for calculation
-            
-        Returns:
-            (zenith_deg, azimuth_deg) tuple
+            tilt_deg: Tilt angle from horizontal (degrees)
+            azimuth_deg: Azimuth angle (180 = South)
         """
-        lat = math.radians(self.location['latitude'])
-        lon = self.location['longitude']
-        tz = self.location['timezone']
-        
-        # Day of year
-        doy = timestamp.timetuple().tm_yday
-        
-        # Solar declination (Spencer, 1971)
-        B = 2 * math.pi * (doy - 1) / 365
-        declination = (0.006918 - 0.399912 * math.cos(B) + 0.070257 * math.sin(B)
-                      - 0.006758 * math.cos(2*B) + 0.000907 * math.sin(2*B)
-                      - 0.002697 * math.cos(3*B) + 0.00148 * math.sin(3*B))
-        
-        # Equation of time (minutes)
-        eot = 229.18 * (0.000075 + 0.001868 * math.cos(B) - 0.032077 * math.sin(B)
-                       - 0.014615 * math.cos(2*B) - 0.040849 * math.sin(2*B))
-        
-        # Solar time
-        solar_time = timestamp.hour + timestamp.minute/60 + (4 * (lon - 15*tz) + eot) / 60
-        
-        # Hour angle
-        hour_angle = math.radians(15 * (solar_time - 12))
-        
-        # Solar zenith angle
-        cos_zenith = (math.sin(lat) * math.sin(declination) + 
-                     math.cos(lat) * math.cos(declination) * math.cos(hour_angle))
-        cos_zenith = max(-1, min(1, cos_zenith))
-        zenith = math.acos(cos_zenith)
-        
-        # Solar azimuth angle
-        if math.cos(zenith) != 0:
-            cos_azimuth = ((math.sin(declination) * math.cos(lat) - 
-                          math.cos(declination) * math.sin(lat) * math.cos(hour_angle)) / 
-                         math.sin(zenith))
-            cos_azimuth = max(-1, min(1, cos_azimuth))
-            azimuth = math.acos(cos_azimuth)
-            if hour_angle > 0:
-                azimuth = 2 * math.pi - azimuth
-        else:
-            azimuth = math.pi
-        
-        return math.degrees(zenith), math.degrees(azimuth)
+        self.config.tilt_deg = tilt_deg
+        self.config.azimuth_deg = azimuth_deg
+        self._update_geometry_cache()
     
-    def _calculate_poa_irradiance(self, ghi: float, dni: float, dhi: float,
-                                   zenith_deg: float, azimuth_deg: float) -> float:
+    def get_power_at_timestep(self, timestamp: datetime) -> PVState:
         """
-        Calculate Plane of Array (POA) irradiance.
+        Calculate PV power output for a specific timestep.
         
-        Uses isotropic sky model for simplicity.
+        Timestamps on a weather row are served from a table of the whole
+        weather period, computed on the first call; others are computed
+        directly from the nearest row.
         
         Args:
-            ghi: Global Horizontal Irradiance (W/m²)
-            dni: Direct Normal Irradiance (W/m²)
-            dhi: Diffuse Horizontal Irradiance (W/m²)
-            zenith_deg: Solar zenith angle (degrees)
-            azimuth_deg: Solar azimuth angle (degrees)
+            timestamp: Datetime for calculation
             
         Returns:
-            POA irradiance (W/m²)
+            PVState with all calculated values
         """
-        if zenith_deg >= 90:
-            return 0.0
-        
-        tilt = math.radians(self.config.tilt_deg)
-        surface_azimuth = math.radians(self.config.azimuth_deg)
-        zenith = math.radians(zenith_deg)
-        azimuth = math.radians(azimuth_deg)
-        
-        # Angle of incidence
-        cos_aoi = (math.sin(zenith) * math.sin(tilt) * math.cos(azimuth - surface_azimuth) +
-                  math.cos(zenith) * math.cos(tilt))
-        cos_aoi = max(0, cos_aoi)
-        
-        # Direct beam on tilted surface
-        beam = dni * cos_aoi
-        
-        # Diffuse (isotropic sky model)
-        diffuse = dhi * (1 + math.cos(tilt)) / 2
-        
-        # Ground reflected
-        albedo = 0.2
-        ground = ghi * albedo * (1 - math.cos(tilt)) / 2
-        
-        poa = beam + diffuse + ground
-        return max(0, poa)
+        return PVState(timestamp, *self._compute_values(timestamp))
     
-    def _calculate_cell_temperature(self, poa: float, ambient_temp: float, 
-                                     wind_speed: float) -> float:
+    def _compute_values(self, timestamp: datetime) -> Tuple[float, ...]:
         """
-        Calculate cell temperature using NOCT model.
+        get_power_at_timestep() without the PVState wrapper.
         
-        Args:
-            poa: POA irradiance (W/m²)
-            ambient_temp: Ambient temperature (°C)
-            wind_speed: Wind speed (m/s)
-            
         Returns:
-            Cell temperature (°C)
+            (ghi, dni, dhi, ambient_temp_c, wind_speed_m_s, poa_irradiance,
+            cell_temperature_c, dc_power_kw, ac_power_kw) tuple, in PVState field order
         """
-        # Sandia cell temperature model (simplified)
-        # For open rack: a=-3.56, b=-0.075
-        # For roof mount: a=-2.81, b=-0.0455
+        if self.weather_data is None:
+            raise ValueError("Weather data not loaded. Call load_weather() first.")
         
-        if self.config.array_type == 0:  # Open rack
+        # Find closest weather data (exact match, else nearest; ties go to the later row)
+        ts_values = self._ts_values
+        t = pd.Timestamp(timestamp).value
+        idx = bisect_left(ts_values, t)
+        if idx == len(ts_values) or (idx > 0 and ts_values[idx] != t and
+                                     t - ts_values[idx - 1] < ts_values[idx] - t):
+            idx -= 1
+        elif ts_values[idx] == t:
+            return tuple(self._get_state_table()[idx].tolist())
+        
+        ghi, dni, dhi, ambient_temp, wind_speed = self._wx_values[idx].tolist()
+        
+        self._check_geometry_cache()
+        cfg = self.config
+        if cfg.array_type == 0:  # Open rack
             a, b = -3.56, -0.075
         else:  # Roof mount or tracking
             a, b = -2.81, -0.0455
         
-        # Cell temperature
-        cell_temp = poa * math.exp(a + b * wind_speed) + ambient_temp
+        zenith, azimuth, poa, cell_temp, dc_power, ac_power = _pv_kernel(
+            timestamp.timetuple().tm_yday, timestamp.hour + timestamp.minute/60,
+            math.radians(self.location['latitude']), self.location['longitude'], self.location['timezone'],
+            self._sin_tilt, self._cos_tilt, self._surface_azimuth_rad,
+            self._diffuse_factor, self._ground_factor,
+            ghi, dni, dhi, ambient_temp, wind_speed, a, b,
+            cfg.system_capacity_kw, cfg.temp_coeff_pmax, cfg.ref_temperature, cfg.ref_irradiance,
+            1 - cfg.system_losses_pct / 100, cfg.inverter_capacity_kw, cfg.base_inv_eff
+        )
         
-        return cell_temp
+        return ghi, dni, dhi, ambient_temp, wind_speed, poa, cell_temp, dc_power, ac_power
     
-    def _calculate_dc_power(self, poa: float, cell_temp: float) -> float:
+    def _get_state_table(self) -> np.ndarray:
+        """Results for every weather row, rebuilt when weather or config change."""
+        key = (self.weather_data, tuple(vars(self.config).values()))
+        if (self._state_table is None or key[0] is not self._state_key[0]
+                or key[1] != self._state_key[1]):
+            results = self._simulate_vectorized(slice(None))
+            self._state_table = np.ascontiguousarray(results.to_numpy())
+            self._state_key = key
+        return self._state_table
+    
+    def _simulate_vectorized(self, rows: slice) -> pd.DataFrame:
         """
-        Calculate DC power output.
+        Run the per-timestep model over a block of weather data at once.
+        
+        Array form of _pv_kernel(), which backs get_power_at_timestep().
         
         Args:
-            poa: POA irradiance (W/m²)
-            cell_temp: Cell temperature (°C)
+            rows: Positional slice of weather_data to simulate
             
         Returns:
-            DC power (kW)
+            DataFrame with simulation results, indexed by timestamp
         """
-        if poa <= 0:
-            return 0.0
-        
-        # Temperature correction
-        temp_diff = cell_temp - self.config.ref_temperature
-        temp_factor = 1 + self.config.temp_coeff_pmax * temp_diff
-        
-        # DC power (PVWatts method)
-        dc_power = (self.config.system_capacity_kw * 
-                   (poa / self.config.ref_irradiance) * 
-                   temp_factor)
-        
-        # Apply system losses
-        dc_power *= (1 - self.config.system_losses_pct / 100)
-        
-        return max(0, dc_power)
-    
-    def _calculate_ac_power(self, dc_power: float) -> float:
+        weather = self.weather_data.iloc[rows]
+        index = weather.index
+        
+        # One (column, timestep) block backs the whole results DataFrame;
+        # every stage below writes into its own row
+        block = np.empty((len(self.RESULT_COLUMNS), len(index)), dtype=np.float32)
+        ghi, dni, dhi, ambient_temp, wind_speed, poa, cell_temp, dc_power, ac_power = block
+        for row, col in zip(block, self.WEATHER_FIELDS):
+            row[:] = weather[col].to_numpy()
+        
+        # Without irradiance POA and power are zero and the cell sits at
+        # ambient, so the model below only runs on daylight hours
+        day = (ghi > 0) | (dni > 0) | (dhi > 0)
+        poa[:] = 0
+        cell_temp[:] = ambient_temp
+        dc_power[:] = 0
+        ac_power[:] = 0
+        
+        self._check_geometry_cache()
+        poa_d = self._poa_irradiance(
+            tuple(x[rows][day] for x in self._get_sun_vectors()), self._surface_normal,
+            self._diffuse_factor, self._ground_factor, ghi[day], dni[day], dhi[day]
+        )
+        poa[day] = poa_d
+        cell_temp[day], dc_power[day], ac_power[day] = self._power_from_poa(
+            poa_d, ambient_temp[day], wind_speed[day])
+        
+        return pd.DataFrame(block.T, index=index.rename('timestamp'),
+                            columns=list(self.RESULT_COLUMNS), copy=False)
+    
+    def _get_sun_vectors(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sun vector for every weather row, rebuilt when weather or location change."""
+        key = (self.weather_data, self.location['latitude'],
+               self.location['longitude'], self.location['timezone'])
+        if (self._sun_cache is None or key[0] is not self._sun_key[0]
+                or key[1:] != self._sun_key[1:]):
+            self._sun_cache = self._sun_vector(self.weather_data.index)
+            self._sun_key = key
+        return self._sun_cache
+    
+    def _sun_vector(self, index: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Calculate AC power output with inverter model.
+        Unit vector towards the sun at each timestamp.
         
         Args:
-            dc_power: DC power (kW)
+            index: Timestamps (local standard time)
             
         Returns:
-            AC power (kW)
+            (east, north, up) float32 arrays
         """
-        if dc_power <= 0:
-            return 0.0
-        
-        # Inverter capacity
-        inverter_capacity = self.config.system_capacity_kw / self.config.dc_ac_ratio
+        lat = math.radians(self.location['latitude'])
+        lon = self.location['longitude']
+        tz = self.location['timezone']
+        doy_idx = index.dayofyear.to_numpy() - 1
+        sin_decl = _SIN_DECLINATION[doy_idx]
+        cos_decl = _COS_DECLINATION[doy_idx]
+        
+        # Hour angle in one buffer: minutes into the day shifted to solar
+        # noon (longitude/timezone offset + equation of time), at 0.25 deg/min
+        hour_angle = (index.asi8 % _NS_PER_DAY // _NS_PER_MINUTE).astype(np.float32)
+        hour_angle += _EQUATION_OF_TIME[doy_idx]
+        hour_angle += 4 * (lon - 15*tz) - 720
+        hour_angle *= math.pi / 720
+        afternoon = hour_angle > 0
+        
+        # Zenith and azimuth are only needed through their sines and cosines,
+        # so they are carried that way instead of via arccos/cos round trips
+        cos_ha = np.cos(hour_angle, out=hour_angle)
+        cos_zenith = np.clip(math.sin(lat) * sin_decl + math.cos(lat) * cos_decl * cos_ha, -1, 1)
+        sin_zenith = np.sqrt(1 - cos_zenith * cos_zenith)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cos_azimuth = np.clip((sin_decl * math.cos(lat) - cos_decl * math.sin(lat) * cos_ha) /
+                                  sin_zenith, -1, 1)
+        sin_azimuth = np.sqrt(1 - cos_azimuth * cos_azimuth)
+        np.negative(sin_azimuth, out=sin_azimuth, where=afternoon)  # azimuth = 2*pi - acos(...)
+        overhead = cos_zenith == 0  # azimuth = pi
+        cos_azimuth[overhead] = -1
+        sin_azimuth[overhead] = 0
+        
+        sin_azimuth *= sin_zenith
+        cos_azimuth *= sin_zenith
+        return sin_azimuth, cos_azimuth, cos_zenith
+    
+    def _poa_irradiance(self, sun, normal, diffuse_factor, ground_factor,
+                        ghi, dni, dhi) -> np.ndarray:
+        """
+        Plane-of-array irradiance from the sun vector (isotropic sky).
         
-        # Inverter efficiency curve (simplified PVWatts)
-        # Efficiency varies with load
-        load_fraction = dc_power / (self.config.system_capacity_kw)
+        The only orientation-dependent stage. Orientation terms (normal
+        components, diffuse/ground factors) are floats for one array, or
+        (N, 1) arrays to evaluate N orientations at once, giving an
+        (N, timesteps) result.
         
-        if load_fraction < 0.1:
-            efficiency = self.config.inverter_efficiency_pct / 100 * load_fraction / 0.1
-        else:
-            efficiency = self.config.inverter_efficiency_pct / 100
+        Args:
+            sun: (east, north, up) sun vector from _sun_vector()
+            normal: (east, north, up) array surface normal
+            diffuse_factor: Sky view factor of the array
+            ground_factor: Ground view factor times albedo
+            ghi, dni, dhi: Irradiance arrays for the same timesteps
+            
+        Returns:
+            POA irradiance (W/m²), zero with the sun at or below the horizon
+        """
+        sun_e, sun_n, sun_up = sun
+        normal_e, normal_n, normal_z = normal
+        
+        # POA irradiance (isotropic sky), zero with the sun at or below the horizon
+        cos_aoi = sun_e * normal_e
+        cos_aoi += sun_n * normal_n
+        cos_aoi += sun_up * normal_z
+        np.maximum(cos_aoi, 0, out=cos_aoi)
+        poa = dni * cos_aoi
+        poa += dhi * diffuse_factor
+        poa += ghi * ground_factor
+        np.maximum(poa, 0, out=poa)
+        poa[..., sun_up <= 0] = 0
+        return poa
+    
+    def _power_from_poa(self, poa, ambient, wind) -> Tuple[np.ndarray, ...]:
+        """
+        Cell temperature and DC/AC power from POA irradiance.
         
-        ac_power = dc_power * efficiency
+        Weather arrays are per timestep and broadcast against poa, which may
+        carry a leading orientation axis.
         
-        # Clip to inverter capacity
-        ac_power = min(ac_power, inverter_capacity)
+        Args:
+            poa: POA irradiance from _poa_irradiance()
+            ambient, wind: Ambient temperature and wind speed arrays
+            
+        Returns:
+            (cell_temp, dc_power, ac_power) tuple, shaped like poa
+        """
+        cfg = self.config
         
-        return max(0, ac_power)
-    
-    def get_power_at_timestep(self, timestamp: datetime) -> PVState:
+        # Cell temperature
+        if cfg.array_type == 0:  # Open rack
+            a, b = -3.56, -0.075
+        else:  # Roof mount or tracking
+            a, b = -2.81, -0.0455
+        heating = wind * b
+        heating += a
+        np.exp(heating, out=heating)
+        cell_temp = poa * heating
+        cell_temp += ambient
+        
+        # DC power
+        dc_power = cell_temp - cfg.ref_temperature
+        dc_power *= cfg.temp_coeff_pmax
+        dc_power += 1
+        dc_power *= poa
+        dc_power *= cfg.system_capacity_kw / cfg.ref_irradiance * (1 - cfg.system_losses_pct / 100)
+        np.maximum(dc_power, 0, out=dc_power)
+        dc_power[poa <= 0] = 0
+        
+        # AC power
+        ac_power = dc_power * (cfg.base_inv_eff / (0.1 * cfg.system_capacity_kw))
+        np.minimum(ac_power, cfg.base_inv_eff, out=ac_power)  # efficiency, ramped below 10% load
+        ac_power *= dc_power
+        np.minimum(ac_power, cfg.inverter_capacity_kw, out=ac_power)
+        np.maximum(ac_power, 0, out=ac_power)
+        
+        return cell_temp, dc_power, ac_power
+    
+    def simulate_many_orientations(self, tilts, azimuths) -> np.ndarray:
         """
-        Calculate PV power output for a specific timestep.
+        AC power for several array orientations over the whole weather period.
+        
+        Sun position and weather are shared by every orientation, so this is
+        much cheaper than one simulate() per orientation. Other parameters
+        come from the current config.
         
         Args:
-            timestamp: Datetime for calculation
+            tilts: Tilt angles (degrees), one per orientation
+            azimuths: Azimuth angles (degrees), same length as tilts
             
         Returns:
-            PVState with all calculated values
+            (orientations, timesteps) float32 array of AC power (kW), in
+            weather_data row order
         """
         if self.weather_data is None:
             raise ValueError("Weather data not loaded. Call load_weather() first.")
         
-        # Find closest weather data
-        try:
-            # Try exact match first
-            weather = self.weather_data.loc[timestamp]
-        except KeyError:
-            # Find nearest timestamp
-            idx = self.weather_data.index.get_indexer([timestamp], method='nearest')[0]
-            weather = self.weather_data.iloc[idx]
-        
-        ghi = float(weather['ghi'])
-        dni = float(weather['dni'])
-        dhi = float(weather['dhi'])
-        ambient_temp = float(weather['dry_bulb_c'])
-        wind_speed = float(weather['wind_speed'])
-        
-        # Calculate sun position
-        zenith, azimuth = self._calculate_sun_position(timestamp)
-        
-        # Calculate POA irradiance
-        poa = self._calculate_poa_irradiance(ghi, dni, dhi, zenith, azimuth)
-        
-        # Calculate cell temperature
-        cell_temp = self._calculate_cell_temperature(poa, ambient_temp, wind_speed)
-        
-        # Calculate DC power
-        dc_power = self._calculate_dc_power(poa, cell_temp)
-        
-        # Calculate AC power
-        ac_power = self._calculate_ac_power(dc_power)
-        
-        return PVState(
-            timestamp=timestamp,
-            ghi=ghi,
-            dni=dni,
-            dhi=dhi,
-            ambient_temp_c=ambient_temp,
-            wind_speed_m_s=wind_speed,
-            poa_irradiance=poa,
-            cell_temperature_c=cell_temp,
-            dc_power_kw=dc_power,
-            ac_power_kw=ac_power
+        tilt = np.radians(np.asarray(tilts, dtype=np.float64)).reshape(-1, 1)
+        azimuth = np.radians(np.asarray(azimuths, dtype=np.float64)).reshape(-1, 1)
+        if tilt.shape != azimuth.shape:
+            raise ValueError("tilts and azimuths must have the same length")
+        sin_tilt, cos_tilt = np.sin(tilt), np.cos(tilt)
+        normal = tuple(x.astype(np.float32) for x in
+                       (sin_tilt * np.sin(azimuth), sin_tilt * np.cos(azimuth), cos_tilt))
+        diffuse_factor = ((1 + cos_tilt) / 2).astype(np.float32)
+        ground_factor = (0.2 * (1 - cos_tilt) / 2).astype(np.float32)  # albedo 0.2
+        
+        weather = self.weather_data
+        ghi, dni, dhi, ambient_temp, wind_speed = (
+            weather[col].to_numpy(dtype=np.float32) for col in self.WEATHER_FIELDS)
+        day = (ghi > 0) | (dni > 0) | (dhi > 0)
+        
+        # POA per orientation, then one broadcast thermal/inverter pass
+        poa = self._poa_irradiance(
+            tuple(x[day] for x in self._get_sun_vectors()), normal, diffuse_factor, ground_factor,
+            ghi[day], dni[day], dhi[day]
         )
+        ac_power = np.zeros((len(tilt), len(weather)), dtype=np.float32)
+        ac_power[:, day] = self._power_from_poa(poa, ambient_temp[day], wind_speed[day])[2]
+        return ac_power
     
     def simulate(self, start: Optional[datetime] = None, 
                  end: Optional[datetime] = None) -> pd.DataFrame:
@@ -481,76 +736,119 @@ class SolarPVModel:
         if end is None:
             end = self.weather_data.index[-1]
         
-        # Filter weather data
-        mask = (self.weather_data.index >= start) & (self.weather_data.index <= end)
-        timestamps = self.weather_data.index[mask]
-        
-        results = []
-        for ts in timestamps:
-            state = self.get_power_at_timestep(ts)
-            results.append({
-                'timestamp': state.timestamp,
-                'ghi': state.ghi,
-                'dni': state.dni,
-                'dhi': state.dhi,
-                'ambient_temp_c': state.ambient_temp_c,
-                'wind_speed_m_s': state.wind_speed_m_s,
-                'poa_irradiance': state.poa_irradiance,
-                'cell_temperature_c': state.cell_temperature_c,
-                'dc_power_kw': state.dc_power_kw,
-                'ac_power_kw': state.ac_power_kw
-            })
+        # Rows in range (index is sorted, so this is a binary-search slice)
+        rows = self.weather_data.index.slice_indexer(start, end)
         
-        if not results:
+        if rows.start >= rows.stop:
             raise ValueError(f"No weather data found for date range {start} to {end}. "
                            f"Weather file contains: {self.weather_data.index[0]} to {self.weather_data.index[-1]}")
         
-        self.results = pd.DataFrame(results)
-        self.results.set_index('timestamp', inplace=True)
+        self.results = self._simulate_vectorized(rows)
+        self._results_version += 1
+        
+        # First row of each day/month, for the production summaries
+        days = self.results.index.values.astype('datetime64[D]')
+        months = days.astype('datetime64[M]')
+        self._day_starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        self._month_starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
         
         return self.results
     
+    # Results column summed per period -> summary column name
+    PRODUCTION_SUMS = (
+        ('ac_power_kw', 'ac_energy_kwh'),  # kWh (assuming hourly data)
+        ('dc_power_kw', 'dc_energy_kwh'),
+        ('poa_irradiance', 'poa_wh_m2'),
+        ('ghi', 'ghi_wh_m2'),
+    )
+    
+    def _sum_by_period(self, starts: np.ndarray, unit: str) -> Tuple[np.ndarray, dict]:
+        """
+        Sum the production columns over consecutive result rows.
+        
+        Args:
+            starts: First row of each period (from simulate())
+            unit: datetime64 unit of the period ('D' or 'M')
+            
+        Returns:
+            (periods, sums) - every period from first to last as datetime64[unit],
+            including empty ones (zero sums) like DataFrame.resample, and a dict
+            of summary column -> float64 sums
+        """
+        labels = self.results.index.values[starts].astype(f'datetime64[{unit}]')
+        periods = np.arange(labels[0], labels[-1] + 1)
+        pos = (labels - labels[0]).astype(np.int64)
+        
+        sums = {}
+        for col, name in self.PRODUCTION_SUMS:
+            total = np.zeros(len(periods))
+            total[pos] = np.add.reduceat(self.results[col].to_numpy(), starts, dtype=np.float64)
+            sums[name] = total
+        return periods, sums
+    
+    def _cached_summary(self, name: str, compute, *key):
+        """
+        Memoize a results summary until the next simulate().
+        
+        Args:
+            name: Cache slot
+            compute: Zero-argument function building the summary
+            *key: Other inputs (e.g. config values) the summary depends on
+            
+        Returns:
+            Copy of the cached summary, so callers can modify it freely
+        """
+        key = (self._results_version, id(self.results)) + key
+        hit = self._summary_cache.get(name)
+        if hit is None or hit[0] != key:
+            hit = (key, compute())
+            self._summary_cache[name] = hit
+        return hit[1].copy()
+    
     def get_daily_production(self) -> pd.DataFrame:
         """Get daily energy production summary."""
         if self.results is None:
             raise ValueError("No simulation results. Call simulate() first.")
-        
-        daily = self.results.resample('D').agg({
-            'ac_power_kw': 'sum',  # kWh (assuming hourly data)
-            'dc_power_kw': 'sum',
-            'poa_irradiance': 'sum',
-            'ghi': 'sum'
-        })
-        daily.columns = ['ac_energy_kwh', 'dc_energy_kwh', 'poa_wh_m2', 'ghi_wh_m2']
-        return daily
+        return self._cached_summary('daily', self._daily_production)
+    
+    def _daily_production(self) -> pd.DataFrame:
+        """Build the daily summary (uncached)."""
+        days, sums = self._sum_by_period(self._day_starts, 'D')
+        index = pd.DatetimeIndex(days.astype('datetime64[ns]'), name=self.results.index.name)
+        return pd.DataFrame(sums, index=index)
     
     def get_monthly_production(self) -> pd.DataFrame:
         """Get monthly energy production summary."""
         if self.results is None:
             raise ValueError("No simulation results. Call simulate() first.")
-        
-        monthly = self.results.resample('M').agg({
-            'ac_power_kw': 'sum',
-            'dc_power_kw': 'sum',
-            'poa_irradiance': 'sum',
-            'ghi': 'sum'
-        })
-        monthly.columns = ['ac_energy_kwh', 'dc_energy_kwh', 'poa_wh_m2', 'ghi_wh_m2']
-        return monthly
+        return self._cached_summary('monthly', self._monthly_production)
+    
+    def _monthly_production(self) -> pd.DataFrame:
+        """Build the monthly summary (uncached)."""
+        # Labelled by the last day of each month, as resample('M') did
+        months, sums = self._sum_by_period(self._month_starts, 'M')
+        month_ends = (months + 1).astype('datetime64[D]') - 1
+        index = pd.DatetimeIndex(month_ends.astype('datetime64[ns]'), name=self.results.index.name)
+        return pd.DataFrame(sums, index=index)
     
     def get_annual_production(self) -> dict:
         """Get annual energy production summary."""
         if self.results is None:
             raise ValueError("No simulation results. Call simulate() first.")
-        
+        return self._cached_summary('annual', self._annual_production,
+                                    self.config.system_capacity_kw, self.config.dc_ac_ratio)
+    
+    def _annual_production(self) -> dict:
+        """Build the annual summary (uncached)."""
+        ac_sum = self.results['ac_power_kw'].to_numpy().sum(dtype=np.float64)
+        dc_sum = self.results['dc_power_kw'].to_numpy().sum(dtype=np.float64)
         return {
-            'ac_energy_kwh': self.results['ac_power_kw'].sum(),
-            'dc_energy_kwh': self.results['dc_power_kw'].sum(),
-            'capacity_factor': self.results['ac_power_kw'].sum() / (self.config.system_capacity_kw / self.config.dc_ac_ratio * len(self.results)),
-            'specific_yield_kwh_kwp': self.results['ac_power_kw'].sum() / self.config.system_capacity_kw
+            'ac_energy_kwh': ac_sum,
+            'dc_energy_kwh': dc_sum,
+            'capacity_factor': ac_sum / (self.config.inverter_capacity_kw * len(self.results)),
+            'specific_yield_kwh_kwp': ac_sum / self.config.system_capacity_kw
         }
 
-
 def create_pv_system(
     capacity_kw: float = 100.0,
     tilt_deg: Optional[float] = None,
@@ -581,6 +879,34 @@ def create_pv_system(
     return SolarPVModel(config)
 
 
+
+def _simulate_file(epw_path: str, config_kwargs: dict) -> pd.DataFrame:
+    """Worker for simulate_batch(): build a system, load one EPW and simulate it."""
+    pv = create_pv_system(**config_kwargs)
+    pv.load_weather(epw_path)
+    return pv.simulate()
+
+
+def simulate_batch(epw_paths: List[str], config_kwargs: Optional[dict] = None,
+                   max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Simulate the same PV system against several weather files in parallel.
+    
+    Each file is independent, so they are spread over worker processes.
+    
+    Args:
+        epw_paths: EPW weather files to simulate
+        config_kwargs: Keyword arguments for create_pv_system() (defaults if None)
+        max_workers: Worker processes (None = one per CPU)
+        
+    Returns:
+        Dict of EPW path -> simulation results DataFrame, in input order
+    """
+    config_kwargs = config_kwargs or {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {path: executor.submit(_simulate_file, path, config_kwargs) for path in epw_paths}
+        return {path: future.result() for path, future in futures.items()}
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Solar PV Model Example")
@@ -627,8 +953,8 @@ if __name__ == "__main__":
         # Monthly summary
         print(f"\nMonthly Production (kWh):")
         monthly = pv.get_monthly_production()
-        for idx, row in monthly.iterrows():
-            print(f"  {idx.strftime('%B')}: {row['ac_energy_kwh']:,.0f} kWh")
+        for idx, energy in zip(monthly.index, monthly['ac_energy_kwh'].tolist()):
+            print(f"  {idx.strftime('%B')}: {energy:,.0f} kWh")
             
     except FileNotFoundError:
         print(f"Weather file not found: {weather_file}")
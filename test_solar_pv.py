@@ -4,9 +4,14 @@ Test script for Solar PV Model
 Demonstrates the PV model with different configurations and weather files.
 """
 
+import argparse
+import io
+import os
 import sys
+from contextlib import redirect_stdout
 from pathlib import Path
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
 
 from solar_pv_model import (
     SolarPVModel, 
@@ -15,6 +20,9 @@ from solar_pv_model import (
     EPWReader
 )
 
+# Run Tests 2-7 concurrently in worker processes (disable with --serial)
+PARALLEL = True
+
 
 def test_epw_reader():
     """Test EPW file reading."""
@@ -142,10 +150,13 @@ def test_daily_simulation(weather_file: str):
     
     print("\nHourly Production:")
     print("-" * 60)
-    for idx, row in results.iterrows():
-        if row['ac_power_kw'] > 0:
-            bar = '█' * int(row['ac_power_kw'] / 5)
-            print(f"{idx.strftime('%H:%M')} | {row['ac_power_kw']:6.1f} kW | {bar}")
+    lines = []
+    for idx, ac in zip(results.index, results['ac_power_kw'].tolist()):
+        if ac > 0:
+            bar = '█' * int(ac / 5)
+            lines.append(f"{idx.strftime('%H:%M')} | {ac:6.1f} kW | {bar}")
+    if lines:
+        print("\n".join(lines))
     
     daily_kwh = results['ac_power_kw'].sum()
     peak_kw = results['ac_power_kw'].max()
@@ -185,9 +196,11 @@ def test_annual_simulation(weather_file: str):
     monthly = pv.get_monthly_production()
     print(f"\nMonthly Production:")
     print("-" * 40)
-    for idx, row in monthly.iterrows():
-        bar = '█' * int(row['ac_energy_kwh'] / 500)
-        print(f"{idx.strftime('%Y-%b'):>8} | {row['ac_energy_kwh']:>8,.0f} kWh | {bar}")
+    lines = []
+    for idx, energy in zip(monthly.index, monthly['ac_energy_kwh'].tolist()):
+        bar = '█' * int(energy / 500)
+        lines.append(f"{idx.strftime('%Y-%b'):>8} | {energy:>8,.0f} kWh | {bar}")
+    print("\n".join(lines))
 
 
 def test_different_configurations(weather_file: str):
@@ -208,18 +221,18 @@ def test_different_configurations(weather_file: str):
     print(f"{'Configuration':<35} {'Annual kWh':>12} {'Yield':>10}")
     print("-" * 60)
     
-    for cfg in configs:
-        pv = create_pv_system(
-            capacity_kw=100,
-            azimuth_deg=cfg['azimuth'],
-            tilt_deg=cfg['tilt']
-        )
-        pv.load_weather(weather_file)
-        pv.simulate()
-        annual = pv.get_annual_production()
-        
-        print(f"{cfg['name']:<35} {annual['ac_energy_kwh']:>12,.0f} "
-              f"{annual['specific_yield_kwh_kwp']:>10,.0f}")
+    # All orientations in one pass over the weather (shared sun position)
+    pv = create_pv_system(capacity_kw=100)
+    pv.load_weather(weather_file)
+    latitude_tilt = pv.config.tilt_deg
+    ac_power = pv.simulate_many_orientations(
+        [cfg['tilt'] if cfg['tilt'] is not None else latitude_tilt for cfg in configs],
+        [cfg['azimuth'] for cfg in configs]
+    )
+    
+    for cfg, annual_kwh in zip(configs, ac_power.sum(axis=1, dtype=float).tolist()):
+        print(f"{cfg['name']:<35} {annual_kwh:>12,.0f} "
+              f"{annual_kwh / pv.config.system_capacity_kw:>10,.0f}")
 
 
 def test_integration_with_battery():
@@ -263,22 +276,28 @@ def test_integration_with_battery():
         print(f"  Battery: 100 kWh, 25 kW max power")
         print(f"  Building Load: 30 kW constant (simplified)")
         
-        # Simulate one day using the actual year from weather file
+        # Simulate July 15 from the rows the file actually has (TMY files mix
+        # years, so it need not fall in the year of the first row)
         building_load = 30  # kW constant
-        start = datetime(weather_year, 7, 15, 0, 0)
+        index = pv.weather_data.index
+        july_15 = index[(index.month == 7) & (index.day == 15)]
+        start = july_15[0] if len(july_15) else datetime(weather_year, 7, 15, 0, 0)
         
         print(f"\nSimulating {start.date()}:")
         print("-" * 80)
         print(f"{'Hour':>5} {'PV kW':>8} {'Load':>8} {'Action':<20} {'Batt kW':>8} {'SOC':>8}")
         print("-" * 80)
         
-        for hour in range(24):
-            ts = start + timedelta(hours=hour)
-            
-            # Get PV production
-            pv_state = pv.get_power_at_timestep(ts)
-            pv_power = pv_state.ac_power_kw
-            
+        if len(july_15):
+            # PV production for the whole day up front; only the battery is stepped
+            pv_day = pv.simulate(start, start + timedelta(hours=23))
+            hourly_pv = zip(pv_day.index.hour, pv_day['ac_power_kw'].tolist())
+        else:
+            # No July 15 rows; use the nearest row for each hour
+            hourly_pv = ((hour, pv.get_power_at_timestep(start + timedelta(hours=hour)).ac_power_kw)
+                         for hour in range(24))
+        
+        for hour, pv_power in hourly_pv:
             # Simple control logic
             net_power = pv_power - building_load
             
@@ -314,8 +333,21 @@ def test_integration_with_battery():
         print("Battery model not found. Skipping integration test.")
 
 
+def _run_captured(test, *args) -> str:
+    """Run one test in a worker process and return everything it printed."""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        test(*args)
+    return buf.getvalue()
+
+
 def main():
     """Run all tests."""
+    parser = argparse.ArgumentParser(description='Solar PV model test suite.')
+    parser.add_argument('--serial', action='store_true',
+                        help='Run the tests one after another in this process')
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("SOLAR PV MODEL TEST SUITE")
     print("=" * 60)
@@ -328,23 +360,25 @@ def main():
         print("Please ensure EPW files exist in the weather/ directory.")
         return
     
-    # Test 2: Configuration
-    test_pv_system_config()
-    
-    # Test 3: Single timestep
-    test_single_timestep(weather_file)
-    
-    # Test 4: Daily simulation
-    test_daily_simulation(weather_file)
-    
-    # Test 5: Annual simulation
-    test_annual_simulation(weather_file)
-    
-    # Test 6: Configuration comparison
-    test_different_configurations(weather_file)
+    tests = [
+        (test_pv_system_config,),                   # Test 2: Configuration
+        (test_single_timestep, weather_file),       # Test 3: Single timestep
+        (test_daily_simulation, weather_file),      # Test 4: Daily simulation
+        (test_annual_simulation, weather_file),     # Test 5: Annual simulation
+        (test_different_configurations, weather_file),  # Test 6: Configuration comparison
+        (test_integration_with_battery,),           # Test 7: Integration with battery
+    ]
     
-    # Test 7: Integration with battery
-    test_integration_with_battery()
+    if PARALLEL and not args.serial:
+        # Tests are independent once the weather file is known; output is
+        # captured per test and printed in order
+        with ProcessPoolExecutor(max_workers=min(len(tests), os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(_run_captured, *test) for test in tests]
+            for future in futures:
+                print(future.result(), end='')
+    else:
+        for test, *test_args in tests:
+            test(*test_args)
     
     print("\n" + "=" * 60)
     print("ALL TESTS COMPLETED")
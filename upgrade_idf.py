@@ -12,13 +12,24 @@ Usage:
 """
 
 import os
+import io
+import re
+import mmap
 import sys
+import json
+import time
 import argparse
 import subprocess
 import tempfile
 import zipfile
 import shutil
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stdout
+from functools import lru_cache, partial
 from pathlib import Path
 
 
@@ -33,9 +44,57 @@ TRANSITIONS = [
     ("25.1", "25.2"),
 ]
 
+# Version -> the version its transition tool produces
+_NEXT_VERSION = dict(TRANSITIONS)
+
+
+def _build_paths():
+    """Map (from, to) to the tuple of hops for every possible upgrade."""
+    paths = {}
+    for src in _NEXT_VERSION:
+        hops = []
+        version = src
+        while version in _NEXT_VERSION:
+            hops.append((version, _NEXT_VERSION[version]))
+            version = _NEXT_VERSION[version]
+            paths[(src, version)] = tuple(hops)
+    return paths
+
+
+# (from major, to major) -> tuple of (src, dst) hops between them
+_PATHS = _build_paths()
+
 # GitHub release URLs for transition tools
 TRANSITION_BASE_URL = "https://github.com/NREL/EnergyPlus/releases/download"
 
+# Chunk size for streaming transition tool downloads to disk
+DOWNLOAD_CHUNK_BYTES = 1 << 16
+
+# Record of download attempts, kept in the cache directory:
+# {exe_name: {"url": url that served it} or {"missing_since": unix time}}
+DOWNLOAD_INDEX_FILE = '.download_index.json'
+
+# Tools GitHub reported missing are not asked for again until this has passed
+MISSING_TOOL_RETRY_HOURS = 24
+
+# File in the cache directory holding the last engine version probe
+ENGINE_CACHE_FILE = 'engine.json'
+
+# Header line of the Energy+.idd shipped with the engine, e.g. "!IDD_Version 23.2.0"
+_IDD_VERSION_RE = re.compile(rb'!IDD_Version\s+(\d+\.\d+\.\d+)')
+
+# Bytes read from the top of Energy+.idd when looking for its version
+IDD_HEAD_BYTES = 4096
+
+# Matches the IDF "Version,X.Y;" object, including the split-line form
+_VERSION_RE = re.compile(rb'^\s*Version\s*,\s*([\d.]+)\s*;', re.MULTILINE | re.IGNORECASE)
+
+# Bytes scanned from the top of an IDF when looking for the Version object
+VERSION_HEAD_BYTES = 65536
+
+# Concurrent header reads for --check (I/O bound, so threads overlap latency)
+CHECK_READ_WORKERS = 32
+
 # Common EnergyPlus installation paths
 EPLUS_INSTALL_PATHS = [
     "C:\\EnergyPlusV{ver}",
@@ -46,8 +105,65 @@ EPLUS_INSTALL_PATHS = [
 ]
 
 
-def get_engine_version():
-    """Get the actual EnergyPlus engine version."""
+@lru_cache(maxsize=None)
+def get_engine_version(cache_dir=None):
+    """
+    Get the actual EnergyPlus engine version (looked up once per process).
+    
+    The version is read from the Energy+.idd installed alongside
+    pyenergyplus. Only when that file is missing is EnergyPlus run to
+    report its version; if cache_dir is given, that probe result is stored
+    there, keyed by the EnergyPlus API module path and mtime, so later runs
+    skip the probe until pyenergyplus is reinstalled or upgraded.
+    """
+    version = _read_idd_version()
+    if version:
+        return version
+    
+    probe_key = None
+    cache_path = os.path.join(cache_dir, ENGINE_CACHE_FILE) if cache_dir else None
+    
+    if cache_path:
+        try:
+            from pyenergyplus import api as eplus_api
+            probe_key = f"{eplus_api.__file__}:{os.path.getmtime(eplus_api.__file__)}"
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+            if cached.get('key') == probe_key:
+                return cached['version']
+        except:
+            pass
+    
+    version = _probe_engine_version()
+    if version is None:
+        return "23.2.0"  # Default
+    
+    if cache_path and probe_key:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, 'w') as f:
+                json.dump({'key': probe_key, 'version': version}, f)
+        except OSError:
+            pass
+    return version
+
+
+def _read_idd_version():
+    """Read the engine version from the Energy+.idd next to pyenergyplus."""
+    try:
+        from pyenergyplus import api as eplus_api
+        eplus_dir = os.path.dirname(os.path.dirname(os.path.abspath(eplus_api.__file__)))
+        with open(os.path.join(eplus_dir, 'Energy+.idd'), 'rb') as f:
+            match = _IDD_VERSION_RE.search(f.read(IDD_HEAD_BYTES))
+        if match:
+            return match.group(1).decode()
+    except:
+        pass
+    return None
+
+
+def _probe_engine_version():
+    """Run EnergyPlus on a dummy IDF and read its version banner."""
     try:
         from pyenergyplus.api import EnergyPlusAPI
         
@@ -64,11 +180,12 @@ def get_engine_version():
             f.write('Version,99.9;')
         
         # Suppress output
-        import io
         from contextlib import redirect_stdout, redirect_stderr
         with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
             api.runtime.run_energyplus(state, ['-d', tmpdir, idf_path])
         
+        api.state_manager.delete_state(state)
+        
         if os.path.exists(err_path):
             with open(err_path, 'r') as f:
                 content = f.read()
@@ -76,27 +193,32 @@ def get_engine_version():
                     if 'Program Version' in line and 'EnergyPlus' in line:
                         parts = line.split('Version')[2].strip().split(',')[0].strip()
                         return parts.split('-')[0]  # Return just "23.2.0"
-        
-        api.state_manager.delete_state(state)
     except:
         pass
-    return "23.2.0"  # Default
+    return None
 
 
 def get_idf_version(filepath):
     """Extract version from an IDF file."""
     try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                if 'Version,' in line and not line.strip().startswith('!'):
-                    parts = line.split(',')
-                    if len(parts) >= 2:
-                        return parts[1].strip().rstrip(';')
+        with open(filepath, 'rb') as f:
+            # The Version object sits near the top, so only the head of the
+            # mapped file is scanned
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                match = _VERSION_RE.search(mm, 0, VERSION_HEAD_BYTES)
+                if match:
+                    return match.group(1).decode()
     except:
         pass
     return None
 
 
+def _version_tuple(version):
+    """Parse 'X.Y[.Z]' into an (X, Y) tuple of ints that compares natively."""
+    major, minor = (version.split('.') + ['0'])[:2]
+    return (int(major), int(minor))
+
+
 def get_transition_path(from_version, to_version):
     """Get the path needed to transition from one version to another."""
     from_major = '.'.join(from_version.split('.')[:2])
@@ -105,59 +227,78 @@ def get_transition_path(from_version, to_version):
     if from_major == to_major:
         return []  # Same version, no transition needed
     
-    path = []
-    current = from_major
-    
-    for src, dst in TRANSITIONS:
-        if current == src:
-            path.append((src, dst))
-            current = dst
-            if current == to_major:
-                break
-    
-    if current != to_major:
+    path = _PATHS.get((from_major, to_major))
+    if path is None:
         return None  # No valid path found
     
-    return path
+    return list(path)
 
 
+@lru_cache(maxsize=1)
 def find_local_eplus_installations():
-    """Find local EnergyPlus installations with transition tools."""
-    installations = []
-    
+    """Find local EnergyPlus installations with transition tools (cached)."""
     if sys.platform == 'win32':
         # Search common Windows paths
-        for drive in ['C:', 'D:']:
-            import glob
-            patterns = [
-                f"{drive}\\EnergyPlusV*",
-                f"{drive}\\Program Files\\EnergyPlusV*",
-                f"{drive}\\Program Files (x86)\\EnergyPlusV*",
-            ]
-            for pattern in patterns:
-                for path in glob.glob(pattern):
-                    updater_path = os.path.join(path, 'PreProcess', 'IDFVersionUpdater')
-                    if os.path.exists(updater_path):
-                        installations.append(updater_path)
+        pattern = "EnergyPlusV*/PreProcess/IDFVersionUpdater"
+        roots = [Path(f"{drive}/{parent}") for drive in ['C:', 'D:']
+                 for parent in ['', 'Program Files', 'Program Files (x86)']]
     else:
         # Linux/Mac
-        import glob
-        patterns = [
-            "/usr/local/EnergyPlus-*",
-            "/Applications/EnergyPlus-*",
-            os.path.expanduser("~/EnergyPlus-*"),
-        ]
-        for pattern in patterns:
-            for path in glob.glob(pattern):
-                updater_path = os.path.join(path, 'PreProcess', 'IDFVersionUpdater')
-                if os.path.exists(updater_path):
-                    installations.append(updater_path)
+        pattern = "EnergyPlus-*/PreProcess/IDFVersionUpdater"
+        roots = [Path("/usr/local"), Path("/Applications"), Path.home()]
     
-    return installations
+    # glob only yields paths that exist, so no separate existence check
+    installations = [str(p) for root in roots if root.is_dir() for p in root.glob(pattern)]
+    
+    return tuple(installations)
+
+
+# Process id -> HTTP session, so forked workers never share pooled sockets
+_sessions = {}
+
+
+def _get_session():
+    """HTTP session for GitHub downloads, with connection reuse and retries."""
+    session = _sessions.get(os.getpid())
+    if session is None:
+        session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504])
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                              max_retries=retry))
+        _sessions[os.getpid()] = session
+    return session
+
+
+def _load_download_index(cache_dir):
+    """Load the transition tool download index from the cache directory."""
+    try:
+        with open(os.path.join(cache_dir, DOWNLOAD_INDEX_FILE), 'r') as f:
+            return json.load(f)
+    except:
+        return {}
+
+
+def _save_download_index(cache_dir, index):
+    """Write the download index atomically (never leaves a partial file)."""
+    index_path = os.path.join(cache_dir, DOWNLOAD_INDEX_FILE)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        pass
 
 
 def find_transition_tool(from_ver, to_ver, local_paths, cache_dir):
-    """Find transition tool locally or download it."""
+    """Find transition tool locally or download it (once per process)."""
+    return _find_transition_tool_cached(from_ver, to_ver, tuple(local_paths), cache_dir)
+
+
+@lru_cache(maxsize=64)
+def _find_transition_tool_cached(from_ver, to_ver, local_paths, cache_dir):
+    """Look up or download one transition tool; see find_transition_tool."""
     from_parts = from_ver.replace('.', '-')
     to_parts = to_ver.replace('.', '-')
     
@@ -177,6 +318,16 @@ def find_transition_tool(from_ver, to_ver, local_paths, cache_dir):
     if os.path.exists(exe_path):
         return exe_path, cache_dir
     
+    # Skip tools GitHub recently reported missing
+    index = _load_download_index(cache_dir)
+    entry = index.get(exe_name, {})
+    missing_since = entry.get('missing_since')
+    if missing_since and time.time() - missing_since < MISSING_TOOL_RETRY_HOURS * 3600:
+        hours_ago = (time.time() - missing_since) / 3600
+        print(f"      Transition tool {from_ver} -> {to_ver} not on GitHub "
+              f"(checked {hours_ago:.0f}h ago, retrying after {MISSING_TOOL_RETRY_HOURS}h)")
+        return None, None
+    
     # Try to download from GitHub releases
     tag = f"v{to_ver}.0"
     
@@ -186,37 +337,92 @@ def find_transition_tool(from_ver, to_ver, local_paths, cache_dir):
         f"{TRANSITION_BASE_URL}/{tag}/{exe_name}",
         f"{TRANSITION_BASE_URL}/{tag}/PreProcess/{exe_name}",
     ]
+    # Start with the URL that served this tool last time
+    if entry.get('url') in urls_to_try:
+        urls_to_try.remove(entry['url'])
+        urls_to_try.insert(0, entry['url'])
     
+    not_found = 0
+    tmp_path = f"{exe_path}.{os.getpid()}.part"
     for url in urls_to_try:
         try:
-            response = requests.get(url, timeout=30)
-            if response.status_code == 200:
-                with open(exe_path, 'wb') as f:
-                    f.write(response.content)
-                if sys.platform != 'win32':
-                    os.chmod(exe_path, 0o755)
-                print(f"      ✓ Downloaded: {exe_name}")
-                return exe_path, cache_dir
+            with _get_session().get(url, timeout=30, stream=True) as response:
+                if response.status_code == 404:
+                    not_found += 1
+                    continue
+                if response.status_code != 200:
+                    continue
+                # Stream to a temporary name so an interrupted download
+                # never leaves a truncated tool in the cache
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_BYTES):
+                        f.write(chunk)
+            if sys.platform != 'win32':
+                os.chmod(tmp_path, 0o755)
+            os.replace(tmp_path, exe_path)
+            print(f"      ✓ Downloaded: {exe_name}")
+            index[exe_name] = {'url': url}
+            _save_download_index(cache_dir, index)
+            return exe_path, cache_dir
         except:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
             continue
     
+    # Only a definite "not found" everywhere is remembered; network errors are retried
+    if not_found == len(urls_to_try):
+        index[exe_name] = {'missing_since': time.time()}
+        _save_download_index(cache_dir, index)
+    
     return None, None
 
 
+def _stage_idf(idf_path, from_ver, working_dir):
+    """Back up an IDF and link it into the transition working directory."""
+    # Create backup
+    backup_path = idf_path + f".v{from_ver}.backup"
+    if not os.path.exists(backup_path):
+        shutil.copyfile(idf_path, backup_path)
+    
+    # Link IDF into working directory (transition tools need IDD files in same
+    # dir); the backup above is a real copy, so a tool writing in place is safe
+    temp_idf = os.path.join(working_dir, os.path.basename(idf_path))
+    if os.path.exists(temp_idf):
+        os.remove(temp_idf)
+    try:
+        os.link(idf_path, temp_idf)
+    except OSError:
+        shutil.copyfile(idf_path, temp_idf)
+    return temp_idf
+
+
+def _unstage_idf(idf_path, temp_idf):
+    """Move the transitioned IDF back (copy when on another filesystem)."""
+    if os.path.exists(temp_idf):
+        try:
+            os.replace(temp_idf, idf_path)
+        except OSError:
+            shutil.copyfile(temp_idf, idf_path)
+
+
+def _clean_transition_files(working_dir, idf_name):
+    """Remove what a successful transition left in the working directory."""
+    for ext in ['.idfold', '.idfnew', '.VCperr']:
+        temp_file = os.path.join(working_dir, idf_name.replace('.idf', ext))
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+    temp_idf = os.path.join(working_dir, idf_name)
+    if os.path.exists(temp_idf):
+        os.remove(temp_idf)
+
+
 def run_transition(idf_path, from_ver, to_ver, transition_exe, working_dir):
     """Run a single transition on an IDF file."""
     if not os.path.exists(transition_exe):
         return False, "Transition tool not found"
     
-    # Create backup
-    backup_path = idf_path + f".v{from_ver}.backup"
-    if not os.path.exists(backup_path):
-        shutil.copy2(idf_path, backup_path)
-    
-    # Copy IDF to working directory (transition tools need IDD files in same dir)
     idf_name = os.path.basename(idf_path)
-    temp_idf = os.path.join(working_dir, idf_name)
-    shutil.copy2(idf_path, temp_idf)
+    temp_idf = _stage_idf(idf_path, from_ver, working_dir)
     
     # Run transition from the working directory
     try:
@@ -228,20 +434,12 @@ def run_transition(idf_path, from_ver, to_ver, transition_exe, working_dir):
             cwd=working_dir
         )
         
-        # Copy back the upgraded file
-        if os.path.exists(temp_idf):
-            shutil.copy2(temp_idf, idf_path)
+        _unstage_idf(idf_path, temp_idf)
         
         # Check if successful by reading version
         new_version = get_idf_version(idf_path)
         if new_version and new_version.startswith(to_ver):
-            # Clean up temp files
-            for ext in ['.idfold', '.idfnew', '.VCperr']:
-                temp_file = os.path.join(working_dir, idf_name.replace('.idf', ext))
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            if os.path.exists(temp_idf):
-                os.remove(temp_idf)
+            _clean_transition_files(working_dir, idf_name)
             return True, f"Upgraded to {new_version}"
         else:
             return False, f"Version still {new_version}"
@@ -252,6 +450,106 @@ def run_transition(idf_path, from_ver, to_ver, transition_exe, working_dir):
         return False, str(e)
 
 
+def _run_transition_batch(idf_paths, from_ver, to_ver, transition_exe, working_dir):
+    """Run one transition over several IDF files using a .lst file list."""
+    temp_idfs = [_stage_idf(idf_path, from_ver, working_dir) for idf_path in idf_paths]
+    list_name = f"transition_{os.getpid()}.lst"
+    list_path = os.path.join(working_dir, list_name)
+    try:
+        with open(list_path, 'w') as f:
+            f.write('\n'.join(os.path.basename(p) for p in idf_paths) + '\n')
+        subprocess.run(
+            [transition_exe, list_name],
+            capture_output=True,
+            text=True,
+            timeout=120 * len(idf_paths),
+            cwd=working_dir
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        pass
+    finally:
+        if os.path.exists(list_path):
+            os.remove(list_path)
+    
+    for idf_path, temp_idf in zip(idf_paths, temp_idfs):
+        _unstage_idf(idf_path, temp_idf)
+        new_version = get_idf_version(idf_path)
+        if new_version and new_version.startswith(to_ver):
+            _clean_transition_files(working_dir, os.path.basename(idf_path))
+
+
+def upgrade_idf_group(idf_paths, target_version, cache_dir, local_paths):
+    """
+    Upgrade IDF files that need the same chain of transitions.
+    
+    Each transition step runs once for the whole group, so the tool's
+    startup cost is paid per step instead of per file. Any file the batch
+    run did not upgrade is retried on its own.
+    
+    Returns:
+        List of (success, output) tuples in the same order as idf_paths,
+        where output is the report upgrade_idf would print for that file
+    """
+    path = None
+    if len(idf_paths) > 1:
+        version = get_idf_version(idf_paths[0])
+        path = version and get_transition_path(version, target_version)
+    
+    if not path:
+        results = []
+        for idf_path in idf_paths:
+            buf = io.StringIO()
+            with redirect_stdout(buf):
+                success = upgrade_idf(idf_path, target_version, cache_dir, local_paths)
+            results.append((success, buf.getvalue()))
+        return results
+    
+    logs = {}
+    for idf_path in idf_paths:
+        logs[idf_path] = [
+            f"  Upgrading {os.path.basename(idf_path)}: {get_idf_version(idf_path)} -> {target_version}",
+            f"    Path: {' -> '.join([p[0] for p in path] + [path[-1][1]])}",
+        ]
+    
+    pending = list(idf_paths)
+    for from_ver, to_ver in path:
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            exe, working_dir = find_transition_tool(from_ver, to_ver, local_paths, cache_dir)
+        for idf_path in pending:
+            logs[idf_path].extend(buf.getvalue().splitlines())
+        
+        if not exe:
+            for idf_path in pending:
+                logs[idf_path].append(f"    ✗ Could not find transition tool for {from_ver} -> {to_ver}")
+                logs[idf_path].append(f"      Install EnergyPlus or download from: https://github.com/NREL/EnergyPlus/releases")
+            pending = []
+            break
+        
+        if len(pending) > 1:
+            _run_transition_batch(pending, from_ver, to_ver, exe, working_dir)
+        
+        upgraded = []
+        for idf_path in pending:
+            new_version = get_idf_version(idf_path) if len(pending) > 1 else None
+            if new_version and new_version.startswith(to_ver):
+                success = True
+            else:
+                success, msg = run_transition(idf_path, from_ver, to_ver, exe, working_dir)
+            
+            if success:
+                upgraded.append(idf_path)
+                logs[idf_path].append(f"    ✓ {from_ver} -> {to_ver}")
+            else:
+                logs[idf_path].append(f"    ✗ Failed at {from_ver} -> {to_ver}: {msg}")
+        pending = upgraded
+    
+    for idf_path in pending:
+        logs[idf_path].append(f"  ✓ Upgraded to {get_idf_version(idf_path)}")
+    
+    return [(p in pending, '\n'.join(logs[p]) + '\n') for p in idf_paths]
+
+
 def upgrade_idf(idf_path, target_version, cache_dir, local_paths=None):
     """Upgrade an IDF file to the target version."""
     if local_paths is None:
@@ -270,7 +568,7 @@ def upgrade_idf(idf_path, target_version, cache_dir, local_paths=None):
         print(f"  ✓ {os.path.basename(idf_path)} already at version {current_version}")
         return True
     
-    if float(current_major) > float(target_major):
+    if _version_tuple(current_major) > _version_tuple(target_major):
         print(f"  ✗ {os.path.basename(idf_path)} is v{current_version} (newer than target {target_version})")
         print(f"    Downgrading is not supported")
         return False
@@ -304,11 +602,37 @@ def upgrade_idf(idf_path, target_version, cache_dir, local_paths=None):
     return True
 
 
+# Process id -> (EnergyPlusAPI, state) reused by test_idf across runs
+_eplus_instances = {}
+
+
+def _get_api_state():
+    """
+    EnergyPlus API and a fresh state for one simulation.
+    
+    The API (and its loaded library) is created once per process and its
+    state is reset between runs; engines without reset_state get a new one.
+    """
+    pid = os.getpid()
+    if pid not in _eplus_instances:
+        from pyenergyplus.api import EnergyPlusAPI
+        api = EnergyPlusAPI()
+        _eplus_instances[pid] = (api, api.state_manager.new_state())
+        return _eplus_instances[pid]
+    
+    api, state = _eplus_instances[pid]
+    try:
+        api.state_manager.reset_state(state)
+    except AttributeError:
+        api.state_manager.delete_state(state)
+        state = api.state_manager.new_state()
+        _eplus_instances[pid] = (api, state)
+    return api, state
+
+
 def test_idf(idf_path, weather_file=None):
     """Test an IDF file by running a simulation."""
     try:
-        from pyenergyplus.api import EnergyPlusAPI
-        
         # Find weather file if not provided
         if not weather_file:
             weather_dirs = ['weather', 'weather/chicago', 'weather/atlanta']
@@ -324,8 +648,7 @@ def test_idf(idf_path, weather_file=None):
         if not weather_file or not os.path.exists(weather_file):
             return False, "No weather file found"
         
-        api = EnergyPlusAPI()
-        state = api.state_manager.new_state()
+        api, state = _get_api_state()
         
         # Create temp output directory
         output_dir = os.path.join(tempfile.gettempdir(), 'eplus_test_' + os.path.basename(idf_path).replace('.idf', ''))
@@ -337,8 +660,6 @@ def test_idf(idf_path, weather_file=None):
             ['-w', weather_file, '-d', output_dir, idf_path]
         )
         
-        api.state_manager.delete_state(state)
-        
         # Check error file for success
         err_file = os.path.join(output_dir, 'eplusout.err')
         if os.path.exists(err_file):
@@ -362,12 +683,60 @@ def test_idf(idf_path, weather_file=None):
 
 def find_idf_files(directory):
     """Find all IDF files in a directory."""
-    idf_files = []
-    if os.path.exists(directory):
-        for f in os.listdir(directory):
-            if f.endswith('.idf'):
-                idf_files.append(os.path.join(directory, f))
-    return idf_files
+    if not os.path.exists(directory):
+        return []
+    with os.scandir(directory) as entries:
+        return [e.path for e in entries if e.name.endswith('.idf') and e.is_file()]
+
+
+def _process_one(idf_path, upgrade_result, backups, args):
+    """
+    Report one IDF file's upgrade, then test and move it if requested.
+    
+    Runs in a worker process; output is captured so each file's report
+    prints as one block. backups lists the file's backup paths, removed
+    after a move when --clean-backups or --clean-source is given.
+    
+    Returns:
+        (output, counts) where counts is a Counter of upgraded, failed,
+        test_passed, test_failed and moved
+    """
+    upgraded, upgrade_output = upgrade_result
+    counts = Counter()
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        print(upgrade_output, end='')
+        if upgraded:
+            counts['upgraded'] += 1
+            
+            # Test if requested
+            if args.test:
+                print(f"\n  🧪 Testing {os.path.basename(idf_path)}...")
+                test_success, test_msg = test_idf(idf_path, args.weather)
+                
+                if test_success:
+                    print(f"    ✓ {test_msg}")
+                    counts['test_passed'] += 1
+                    
+                    # Move if requested and test passed
+                    if args.move_to:
+                        os.makedirs(args.move_to, exist_ok=True)
+                        dest_path = os.path.join(args.move_to, os.path.basename(idf_path))
+                        shutil.move(idf_path, dest_path, copy_function=shutil.copyfile)
+                        print(f"    ✓ Moved to {args.move_to}/")
+                        counts['moved'] += 1
+                        
+                        # Remove backup/intermediate files if --clean-backups or --clean-source
+                        if args.clean_backups or args.clean_source:
+                            for backup_path in backups:
+                                os.remove(backup_path)
+                                print(f"    ✓ Removed: {os.path.basename(backup_path)}")
+                else:
+                    print(f"    ✗ {test_msg}")
+                    counts['test_failed'] += 1
+        else:
+            counts['failed'] += 1
+    return buf.getvalue(), counts
 
 
 def main():
@@ -421,22 +790,22 @@ Note: Uses local EnergyPlus installations for transition tools if available.
     else:
         print("  ⚠️  No local installations found (will try to download tools)")
     
+    # Setup cache directory for transition tools
+    if args.cache_dir:
+        cache_dir = args.cache_dir
+    else:
+        cache_dir = os.path.join(tempfile.gettempdir(), 'eplus_transitions')
+    os.makedirs(cache_dir, exist_ok=True)
+    
     # Get target version
     if args.target:
         target_version = args.target
     else:
         print("\nDetecting engine version...")
-        target_version = get_engine_version()
+        target_version = get_engine_version(cache_dir)
     
     print(f"Target version: {target_version}")
     
-    # Setup cache directory for transition tools
-    if args.cache_dir:
-        cache_dir = args.cache_dir
-    else:
-        cache_dir = os.path.join(tempfile.gettempdir(), 'eplus_transitions')
-    os.makedirs(cache_dir, exist_ok=True)
-    
     # Handle backup file operations
     if args.list_backups or args.delete_backups:
         print("\nBACKUP FILES")
@@ -444,9 +813,8 @@ Note: Uses local EnergyPlus installations for transition tools if available.
         
         backups = []
         if os.path.exists(args.model_dir):
-            for f in os.listdir(args.model_dir):
-                if '.backup' in f:
-                    backups.append(os.path.join(args.model_dir, f))
+            with os.scandir(args.model_dir) as entries:
+                backups = [e for e in entries if '.backup' in e.name]
         
         if not backups:
             print(f"No backup files found in {args.model_dir}/")
@@ -454,9 +822,9 @@ Note: Uses local EnergyPlus installations for transition tools if available.
         
         print(f"Found {len(backups)} backup file(s):\n")
         
-        for backup_path in sorted(backups):
-            backup_name = os.path.basename(backup_path)
-            size_kb = os.path.getsize(backup_path) / 1024
+        for entry in sorted(backups, key=lambda e: e.name):
+            backup_name = entry.name
+            size_kb = entry.stat().st_size / 1024
             
             # Check if upgraded IDF exists
             parts = backup_name.split('.idf.')
@@ -474,7 +842,7 @@ Note: Uses local EnergyPlus installations for transition tools if available.
             print(f"  {backup_name} ({size_kb:.1f} KB) {status}")
             
             if args.delete_backups:
-                os.remove(backup_path)
+                os.remove(entry.path)
                 print(f"    ✓ Deleted")
         
         print("\n" + "=" * 60)
@@ -505,26 +873,29 @@ Note: Uses local EnergyPlus installations for transition tools if available.
     if args.check:
         print("MODEL VERSION CHECK")
         print("=" * 60)
-        target_major = '.'.join(target_version.split('.')[:2])
+        target_tuple = _version_tuple(target_version)
         
         needs_upgrade = []
         too_new = []
         ok = []
         
-        for idf_path in sorted(idf_files):
-            version = get_idf_version(idf_path)
+        idf_files = sorted(idf_files)
+        with ThreadPoolExecutor(max_workers=min(len(idf_files), CHECK_READ_WORKERS)) as ex:
+            versions = list(ex.map(get_idf_version, idf_files))
+        
+        for idf_path, version in zip(idf_files, versions):
             filename = os.path.basename(idf_path)
             
             if not version:
                 print(f"  ? {filename}: Unknown version")
                 continue
             
-            version_major = '.'.join(version.split('.')[:2])
+            version_tuple = _version_tuple(version)
             
-            if float(version_major) < float(target_major):
+            if version_tuple < target_tuple:
                 needs_upgrade.append((filename, version))
                 print(f"  ⬆️  {filename}: {version} -> needs upgrade")
-            elif float(version_major) > float(target_major):
+            elif version_tuple > target_tuple:
                 too_new.append((filename, version))
                 print(f"  ❌ {filename}: {version} -> too new (cannot downgrade)")
             else:
@@ -539,47 +910,58 @@ Note: Uses local EnergyPlus installations for transition tools if available.
     print("UPGRADING IDF FILES")
     print("=" * 60)
     
-    success_count = 0
-    fail_count = 0
-    test_passed = 0
-    test_failed = 0
-    moved_count = 0
-    
+    # Fetch every transition tool up front so parallel workers never race
+    # each other downloading the same file into the cache. Files needing
+    # the same transitions are grouped so each step runs once per group.
+    hops = set()
+    groups = {}
+    upgrade_results = {}
     for idf_path in idf_files:
-        if upgrade_idf(idf_path, target_version, cache_dir, local_paths):
-            success_count += 1
-            
-            # Test if requested
-            if args.test:
-                print(f"\n  🧪 Testing {os.path.basename(idf_path)}...")
-                test_success, test_msg = test_idf(idf_path, args.weather)
-                
-                if test_success:
-                    print(f"    ✓ {test_msg}")
-                    test_passed += 1
-                    
-                    # Move if requested and test passed
-                    if args.move_to:
-                        os.makedirs(args.move_to, exist_ok=True)
-                        dest_path = os.path.join(args.move_to, os.path.basename(idf_path))
-                        idf_dir = os.path.dirname(idf_path) or '.'
+        version = get_idf_version(idf_path)
+        path = version and get_transition_path(version, target_version)
+        if path == []:
+            # Already at the target version; no worker needed
+            upgrade_results[idf_path] = (
+                True, f"  ✓ {os.path.basename(idf_path)} already at version {version}\n")
+            continue
+        hops.update(path or [])
+        groups.setdefault(tuple(path) if path else idf_path, []).append(idf_path)
+    for from_ver, to_ver in sorted(hops):
+        find_transition_tool(from_ver, to_ver, local_paths, cache_dir)
+    
+    # Groups are independent (the transition tools only touch files named
+    # after their input), so they are upgraded in parallel, and then each
+    # file is tested and moved in parallel
+    totals = Counter()
+    upgrade_group = partial(upgrade_idf_group, target_version=target_version,
+                            cache_dir=cache_dir, local_paths=local_paths)
+    with ProcessPoolExecutor(max_workers=min(len(idf_files), os.cpu_count() or 1)) as ex:
+        for group, results in zip(groups.values(), ex.map(upgrade_group, groups.values())):
+            upgrade_results.update(zip(group, results))
+        
+        # Backups are listed with one scan per directory once upgrades are done
+        backups = {p: [] for p in idf_files}
+        if args.move_to and (args.clean_backups or args.clean_source):
+            for idf_dir in {os.path.dirname(p) or '.' for p in idf_files}:
+                with os.scandir(idf_dir) as entries:
+                    names = [e.name for e in entries if '.backup' in e.name]
+                for idf_path in idf_files:
+                    if (os.path.dirname(idf_path) or '.') == idf_dir:
                         idf_name = os.path.basename(idf_path)
-                        shutil.move(idf_path, dest_path)
-                        print(f"    ✓ Moved to {args.move_to}/")
-                        moved_count += 1
-                        
-                        # Remove backup/intermediate files if --clean-backups or --clean-source
-                        if args.clean_backups or args.clean_source:
-                            for f in os.listdir(idf_dir):
-                                if f.startswith(idf_name) and '.backup' in f:
-                                    backup_path = os.path.join(idf_dir, f)
-                                    os.remove(backup_path)
-                                    print(f"    ✓ Removed: {f}")
-                else:
-                    print(f"    ✗ {test_msg}")
-                    test_failed += 1
-        else:
-            fail_count += 1
+                        backups[idf_path] = [os.path.join(idf_dir, f) for f in names
+                                             if f.startswith(idf_name)]
+        
+        process = partial(_process_one, args=args)
+        for output, counts in ex.map(process, idf_files, [upgrade_results[p] for p in idf_files],
+                                     [backups[p] for p in idf_files]):
+            print(output, end='')
+            totals.update(counts)
+    
+    success_count = totals['upgraded']
+    fail_count = totals['failed']
+    test_passed = totals['test_passed']
+    test_failed = totals['test_failed']
+    moved_count = totals['moved']
     
     print("\n" + "=" * 60)
     print("SUMMARY")